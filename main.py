@@ -2,17 +2,6 @@
 import argparse
 import logging
 
-# 3p
-import datadog
-from dotenv import load_dotenv
-from json_log_formatter import VerboseJSONFormatter
-
-load_dotenv()
-
-# project
-from matrix.app import App  # noqa: E402
-from matrix.utils.config import get_config  # noqa: E402
-
 parser = argparse.ArgumentParser(
     prog="matrix",
     description="LED matrix display driver",
@@ -20,8 +9,40 @@ parser = argparse.ArgumentParser(
 
 parser.add_argument("--simulate", action="store_true")
 parser.add_argument("--logfile", default="/var/log/matrix.log")
+parser.add_argument("--bench", action="store_true", help="run the offscreen render benchmarks and exit")
+parser.add_argument(
+    "--profile-startup",
+    action="store_true",
+    help="log how long each import and startup step took, once the first frame is shown",
+)
+
+args, extra_args = parser.parse_known_args()
+
+from matrix.utils.startup_profile import start_startup_profile, startup_step  # noqa: E402
+
+# Started before anything else is imported, so that every import is timed
+if args.profile_startup:
+    start_startup_profile()
+
+with startup_step("imports"):
+    # 3p
+    import datadog
+    from dotenv import load_dotenv
+    from json_log_formatter import VerboseJSONFormatter
+
+    load_dotenv()
+
+    # project
+    from matrix.app import App
+    from matrix.utils.config import get_config
+
+if args.bench:
+    from matrix.bench import main as bench
 
-args = parser.parse_args()
+    bench(extra_args)
+    raise SystemExit
+elif extra_args:
+    parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
 
 # Load the config first, then update with command-line args
 config = get_config(simulate_arg=args.simulate)
@@ -38,5 +59,6 @@ if not config.is_simulated:
 else:
     logging.getLogger("datadog.dogstatsd").setLevel(logging.FATAL)
 
-app = App()
+with startup_step("app"):
+    app = App()
 app.run()
@@ -1,7 +1,7 @@
 # stdlib
 import logging
 import sys
-import threading
+import time
 from typing import Any
 
 # project
@@ -12,15 +12,15 @@ from matrix.modes.mode import BaseMode, ModeType
 from matrix.modes.network import Network
 from matrix.modes.off import Off
 from matrix.modes.screens import Screens
-from matrix.screens.bluebikes import BlueBikes
-from matrix.screens.forecast import Forecast
-from matrix.screens.mbta import MBTA
+from matrix.screens import create_screen
 from matrix.screens.screen import Screen
-from matrix.screens.spotify import Spotify
-from matrix.screens.weather import Weather
 from matrix.utils.config import get_config
+from matrix.utils.fetch_scheduler import get_fetch_scheduler
 from matrix.utils.matter import Matter
+from matrix.utils.metrics import metrics
 from matrix.utils.no_connection import get_image_no_connection
+from matrix.utils.schedule import FRAME_INTERVAL, request_redraw, wait_for_redraw
+from matrix.utils.startup_profile import finish_startup_profile, startup_step
 from matrix.web_ui import WebUI
 
 logger = logging.getLogger(__name__)
@@ -34,84 +34,116 @@ class App:
         if self.config.is_simulated:
             self.hardware = None
         else:
-            from matrix.utils.hardware import Hardware
-
-            self.hardware = Hardware()
-
-        screens: list[Screen[Any]] = [
-            MBTA(),
-            Spotify(),
-            Weather(),
-            Forecast(),
-            BlueBikes(),
-            # Octoprint(),
-        ]
-        self.modes: dict[ModeType, BaseMode] = {
-            ModeType.MAIN: Main(self.change_mode, screens),
-            ModeType.MENU: Menu(self.change_mode),
-            ModeType.SCREENS: Screens(self.change_mode, screens),
-            ModeType.OFF: Off(self.change_mode),
-        }
+            with startup_step("hardware"):
+                from matrix.utils.hardware import Hardware
+
+                self.hardware = Hardware()
+
+        screens: list[Screen[Any]] = []
+        for name in self.config.screens.rotation:
+            with startup_step(f"screen {name}"):
+                screen = create_screen(name)
+                screen.start()
+            screens.append(screen)
+
+        self.modes: dict[ModeType, BaseMode] = {}
+        with startup_step("mode main"):
+            self.modes[ModeType.MAIN] = Main(self.change_mode, screens)
+        with startup_step("mode menu"):
+            self.modes[ModeType.MENU] = Menu(self.change_mode)
+        with startup_step("mode screens"):
+            self.modes[ModeType.SCREENS] = Screens(self.change_mode, screens)
+        with startup_step("mode off"):
+            self.modes[ModeType.OFF] = Off(self.change_mode)
 
         if self.hardware is not None:
-            brightness = Brightness(self.change_mode, hardware=self.hardware)
+            with startup_step("mode brightness"):
+                brightness = Brightness(self.change_mode, hardware=self.hardware)
             self.modes[ModeType.BRIGHTNESS] = brightness
             if not self.config.is_simulated and self.config.screens.matter:
-                self.matter = Matter(brightness)
-                self.matter.start()
+                with startup_step("matter"):
+                    self.matter = Matter(brightness)
+                    self.matter.start()
             self.hardware.dial.when_rotated_clockwise = self.handle_rotation_clockwise
             self.hardware.dial.when_rotated_counter_clockwise = self.handle_rotation_counterclockwise
             self.hardware.button.when_pressed = self.handle_press
 
         if sys.platform == "linux":
-            self.modes[ModeType.NETWORK] = Network(self.change_mode)
+            with startup_step("mode network"):
+                self.modes[ModeType.NETWORK] = Network(self.change_mode)
 
         self.active_mode: ModeType = ModeType.MAIN
 
-        self.ui = WebUI(
-            port=8080 if self.config.is_simulated else 80,
-            on_rotation_clockwise=self.handle_rotation_clockwise,
-            on_rotation_counterclockwise=self.handle_rotation_counterclockwise,
-            on_press=self.handle_press,
-        )
+        if not self.config.is_simulated:
+            metrics.start_forwarding()
 
-        self.signal_update = threading.Event()
+        with startup_step("web ui"):
+            self.ui = WebUI(
+                port=8080 if self.config.is_simulated else 80,
+                on_rotation_clockwise=self.handle_rotation_clockwise,
+                on_rotation_counterclockwise=self.handle_rotation_counterclockwise,
+                on_press=self.handle_press,
+            )
 
     def change_mode(self, mode: ModeType) -> None:
+        # Nothing is shown while the display is off, so there's no point fetching
+        if mode == ModeType.OFF:
+            get_fetch_scheduler().pause()
+        elif self.active_mode == ModeType.OFF:
+            get_fetch_scheduler().resume()
+
         self.active_mode = mode
+        request_redraw()
         if self.matter and mode in (ModeType.OFF, ModeType.MAIN):
             self.matter.on_mode_change(mode)
 
     def handle_rotation_clockwise(self):
         self.modes[self.active_mode].handle_encoder_clockwise()
-        self.signal_update.set()
+        request_redraw()
 
     def handle_rotation_counterclockwise(self):
         self.modes[self.active_mode].handle_encoder_counterclockwise()
-        self.signal_update.set()
+        request_redraw()
 
     def handle_press(self):
         self.modes[self.active_mode].handle_encoder_push()
-        self.signal_update.set()
+        request_redraw()
 
     def run(self):
         try:
             prev_image = None
             while True:
+                frame_start = time.time()
+                mode = self.modes[self.active_mode]
+                t0 = time.perf_counter()
                 try:
-                    mode = self.modes[self.active_mode]
                     image = mode.get_image()
+                    deadline = mode.next_update()
                 except Exception as e:
                     logger.exception("Exception when drawing image: %s", e)
                     image = get_image_no_connection()
+                    deadline = frame_start + 1  # retry soon
+
+                tags = {"mode": str(self.active_mode)}
+                if isinstance(mode, Main) and mode.current_screen is not None:
+                    tags["screen"] = mode.current_screen.__class__.__name__
+                metrics.record("render", time.perf_counter() - t0, **tags)
 
-                if image != prev_image and image is not None:  # Only send the image if it's different
-                    self.ui.send_frame(image)
+                with metrics.timed("diff", **tags):
+                    changed = image != prev_image and image is not None
+
+                if changed:  # Only send the image if it's different
+                    self.ui.send_frame(image, **tags)
                     if self.hardware is not None:
-                        self.hardware.matrix.SetImage(image.convert("RGB"))
+                        with metrics.timed("upload", **tags):
+                            self.hardware.show(image)
                     prev_image = image
-                if self.signal_update.wait(timeout=1 / 30):
-                    self.signal_update.clear()
+                    finish_startup_profile()
+
+                # Sleep until the mode needs redrawing, or until input or new data arrives
+                if deadline is not None:
+                    deadline = max(deadline, frame_start + FRAME_INTERVAL)
+                wait_for_redraw(deadline)
         finally:
             if self.hardware is not None:
-                self.hardware.matrix.Clear()
+                self.hardware.clear()
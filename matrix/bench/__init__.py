@@ -0,0 +1,174 @@
+"""Offscreen render benchmarks for every screen and mode, on every panel size.
+
+Screens are loaded with fixture data and never start fetching, so results
+are repeatable and don't depend on the network or on display hardware.
+
+Run with `python -m matrix.bench` (or `main.py --bench`) from the repository root.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+
+from matrix.bench import fixtures
+from matrix.modes.brightness import Brightness
+from matrix.modes.main import Main
+from matrix.modes.menu import Menu
+from matrix.modes.mode import BaseMode, ModeType
+from matrix.modes.network import Network, NetworkInfo
+from matrix.modes.off import Off
+from matrix.modes.screens import Screens
+from matrix.screens.bluebikes import BlueBikes
+from matrix.screens.fish import MakeAFish
+from matrix.screens.forecast import Forecast
+from matrix.screens.mbta import MBTA
+from matrix.screens.octoprint import Octoprint
+from matrix.screens.screen import Screen
+from matrix.screens.spotify import Spotify
+from matrix.screens.weather import Weather
+from matrix.utils.config import Config, PanelSize, set_config
+from matrix.utils.panels import Drawable
+
+EXAMPLE_CONFIG = Path(__file__).parents[2] / "matrix.example.toml"
+
+DEFAULT_ITERATIONS = 2000
+WARMUP_ITERATIONS = 20
+# Measuring allocations is slow, so only do it for a sample of frames
+ALLOCATION_ITERATIONS = 100
+
+
+def build_screens() -> list[Screen[Any]]:
+    """Create every screen with fixture data loaded, without starting any fetches."""
+    mbta = MBTA()
+    mbta.load_data(fixtures.mbta_data(mbta.lines))
+
+    spotify = Spotify()
+    spotify.load_data(fixtures.album_art())
+
+    weather = Weather()
+    weather.load_data(fixtures.weather_data())
+
+    forecast = Forecast()
+    forecast.load_data(fixtures.forecast_data())
+
+    bluebikes = BlueBikes()
+    bluebikes.load_data(fixtures.bluebikes_data(list(bluebikes.stations)))
+
+    octoprint = Octoprint()
+    octoprint.load_data(fixtures.octoprint_data())
+
+    fish = MakeAFish()
+    fish.load_data(fixtures.fish_data())
+
+    return [mbta, spotify, weather, forecast, bluebikes, octoprint, fish]
+
+
+def build_modes(screens: list[Screen[Any]]) -> dict[ModeType, BaseMode]:
+    """Create every mode, with stand-ins for the hardware and network."""
+
+    def change_mode(mode: ModeType) -> None:
+        pass
+
+    hardware = SimpleNamespace(matrix=SimpleNamespace(brightness=60))
+
+    return {
+        ModeType.MAIN: Main(change_mode, screens),
+        ModeType.MENU: Menu(change_mode),
+        ModeType.SCREENS: Screens(change_mode, screens),
+        ModeType.OFF: Off(change_mode),
+        ModeType.BRIGHTNESS: Brightness(change_mode, hardware=cast(Any, hardware)),
+        ModeType.NETWORK: Network(change_mode, NetworkInfo(ssid="MatrixBenchNetwork", ip_addr="192.168.1.64")),
+    }
+
+
+def measure(render: Callable[[], object], iterations: int) -> dict[str, float]:
+    for _ in range(WARMUP_ITERATIONS):
+        render()
+
+    timings: list[float] = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    # Peak Python heap growth while drawing a frame, averaged over a sample of frames
+    allocated: list[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, ALLOCATION_ITERATIONS)):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            render()
+            _, peak = tracemalloc.get_traced_memory()
+            allocated.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "frames": iterations,
+        "fps": round(iterations / elapsed, 1),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 4),
+        "p99_ms": round(timings[min(int(len(timings) * 0.99), len(timings) - 1)] * 1000, 4),
+        "alloc_bytes_per_frame": round(statistics.fmean(allocated)),
+    }
+
+
+def drawables() -> Iterator[tuple[str, str, Drawable]]:
+    screens = build_screens()
+    for screen in screens:
+        yield "screen", screen.__class__.__name__, screen
+    # Main rotates through the screens and uses MakeAFish itself at 11:11
+    rotation = [s for s in screens if not isinstance(s, MakeAFish)]
+    for mode_type, mode in build_modes(rotation).items():
+        yield "mode", str(mode_type), mode
+
+
+def run_benchmarks(iterations: int = DEFAULT_ITERATIONS, config_path: Path = EXAMPLE_CONFIG) -> dict[str, Any]:
+    config = Config.load(config_path)
+    config.panel.simulation = True
+    set_config(config)
+
+    results = []
+    for panel_size in PanelSize:
+        config.panel.size = panel_size
+        for kind, name, drawable in drawables():
+            results.append(
+                {
+                    "panel": "x".join(map(str, panel_size.value)),
+                    "kind": kind,
+                    "name": name,
+                    **measure(drawable.get_image, iterations),
+                }
+            )
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="matrix.bench", description="Offscreen render benchmarks")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--config", type=Path, default=EXAMPLE_CONFIG)
+    parser.add_argument("--output", type=Path, help="write results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run_benchmarks(args.iterations, args.config), indent=2)
+    if args.output:
+        args.output.write_text(report + "\n")
+    else:
+        print(report)
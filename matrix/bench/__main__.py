@@ -0,0 +1,3 @@
+from matrix.bench import main
+
+main()
@@ -0,0 +1,107 @@
+"""Recorded and synthetic data for each screen, so they can be rendered without fetching."""
+
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from matrix.screens.bluebikes import BlueBikesData, index_stations
+from matrix.screens.mbta import SCHEDULED_COLOR, MbtaData, Prediction
+from matrix.utils.config import MbtaLine
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Roughly the size of the Boston network, so that lookups cost what they do in production
+GBFS_STATION_COUNT = 500
+
+
+def load_fixture(name: str) -> Any:
+    with (FIXTURES_DIR / name).open() as f:
+        return json.load(f)
+
+
+def weather_data():
+    return load_fixture("weather.json")
+
+
+def forecast_data():
+    return load_fixture("forecast.json")
+
+
+def octoprint_data():
+    fixture = load_fixture("octoprint.json")
+    return {
+        "is_connected": fixture["connection"]["current"]["state"] != "Offline",
+        "current_job": fixture["job"],
+    }
+
+
+def mbta_data(lines: list[MbtaLine]) -> MbtaData:
+    now = datetime.now()
+    line_predictions = [
+        [
+            Prediction(
+                departure_time=now + timedelta(minutes=minutes, seconds=30),
+                type="prediction" if minutes < 20 else "schedule",
+                fill=line.color if minutes < 20 else SCHEDULED_COLOR,
+            )
+            for minutes in (2 + i, 9 + i, 17 + i, 26 + i, 41 + i)
+        ]
+        for i, line in enumerate(lines)
+    ]
+
+    alert = "20min delay: disabled train at Kenmore"
+    return line_predictions, alert, lines[0] if lines else None
+
+
+def bluebikes_data(station_ids: list[str]) -> BlueBikesData:
+    rng = random.Random(0)
+
+    short_names = [f"X{i:05}" for i in range(GBFS_STATION_COUNT - len(station_ids))] + station_ids
+    rng.shuffle(short_names)
+
+    stations = [
+        {
+            "station_id": f"{i:08x}-{rng.getrandbits(32):08x}",
+            "short_name": short_name,
+            "name": f"Station {short_name}",
+            "lat": 42.36 + rng.random() / 10,
+            "lon": -71.06 - rng.random() / 10,
+            "capacity": 19,
+        }
+        for i, short_name in enumerate(short_names)
+    ]
+    statuses = [
+        {
+            "station_id": station["station_id"],
+            "num_bikes_available": rng.randint(0, 12),
+            "num_ebikes_available": rng.randint(0, 4),
+            "num_docks_available": rng.randint(0, 19),
+            "is_renting": 1,
+            "is_returning": 1,
+            "last_reported": 1749930000,
+        }
+        for station in stations
+    ]
+    rng.shuffle(statuses)
+
+    return index_stations(
+        {"last_updated": 1749930000, "ttl": 60, "data": {"stations": stations}},
+        {"last_updated": 1749930000, "ttl": 60, "data": {"stations": statuses}},
+        station_ids,
+    )
+
+
+def album_art() -> Image.Image:
+    image = Image.new("RGB", (64, 64))
+    image.putdata([(x * 4, y * 4, (x ^ y) * 4) for y in range(64) for x in range(64)])
+    return image
+
+
+def fish_data() -> tuple[Image.Image, Image.Image]:
+    fish = Image.new("RGBA", (64, 48), (0, 0, 0, 0))
+    fish.paste((255, 136, 0, 255), (16, 16, 48, 32))
+    return fish, fish.resize((64, 32))
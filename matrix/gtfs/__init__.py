@@ -0,0 +1,281 @@
+"""Offline index of scheduled MBTA departures, built from the GTFS static feed.
+
+The importer keeps only the configured lines' departures, as arrays of
+seconds since the start of each service day, grouped by line and service.
+The arrays are memory-mapped at runtime, so looking up the next departures
+is a binary search instead of a request to the /schedules endpoint, and
+still works while offline.
+"""
+
+import argparse
+import bisect
+import csv
+import io
+import json
+import logging
+import mmap
+import os
+import sys
+import tempfile
+import zipfile
+from array import array
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import IO, Any
+
+import requests
+
+from matrix.utils.config import MbtaLine, get_config
+from matrix.utils.data_store import default_data_dir
+
+logger = logging.getLogger(__name__)
+
+MBTA_GTFS_URL = "https://cdn.mbta.com/MBTA_GTFS.zip"
+
+INDEX_VERSION = 1
+
+# Arrays are stored as native uint32s
+ARRAY_TYPE = "I"
+
+
+def line_key(line: MbtaLine) -> str:
+    return f"{line.route_id}/{line.stop_id}/{line.direction_id}"
+
+
+def parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y%m%d").date()
+
+
+def parse_seconds(value: str) -> int:
+    """Parse a GTFS time, which can go past 24:00:00 for trips after midnight, into seconds."""
+    hours, minutes, seconds = value.split(":")
+    return int(hours) * 60 * 60 + int(minutes) * 60 + int(seconds)
+
+
+class Service:
+    """The days a GTFS service runs on, from calendar.txt and calendar_dates.txt."""
+
+    def __init__(self, spec: dict[str, Any]) -> None:
+        self.weekdays: list[bool] = spec["weekdays"]
+        self.start = parse_date(spec["start"])
+        self.end = parse_date(spec["end"])
+        self.added = {parse_date(d) for d in spec["added"]}
+        self.removed = {parse_date(d) for d in spec["removed"]}
+
+    def is_active(self, day: date) -> bool:
+        if day in self.added:
+            return True
+        if day in self.removed:
+            return False
+        return self.start <= day <= self.end and self.weekdays[day.weekday()]
+
+
+def map_array(path: Path) -> memoryview:
+    """Memory-map a file of uint32s."""
+    if path.stat().st_size == 0:
+        return memoryview(array(ARRAY_TYPE))
+    with path.open("rb") as f:
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast(ARRAY_TYPE)
+
+
+class GtfsIndex:
+    """Scheduled departures of the configured MBTA lines, as written by import_feed()."""
+
+    def __init__(self, directory: Path) -> None:
+        with (directory / "index.json").open() as f:
+            index = json.load(f)
+        if index["version"] != INDEX_VERSION or index["byteorder"] != sys.byteorder:
+            raise ValueError(f"GTFS index in {directory} is incompatible, import it again")
+
+        self.feed_version: str | None = index["feed_version"]
+        self.end_date = parse_date(index["end_date"])
+        self.services = {service_id: Service(spec) for service_id, spec in index["services"].items()}
+        self.trip_ids: list[str] = index["trip_ids"]
+        # line key -> service id -> (offset, count) into the arrays
+        self.groups: dict[str, dict[str, tuple[int, int]]] = index["groups"]
+
+        # Departure times, in seconds since the start of the service day, sorted within each group
+        self.times = map_array(directory / "times.bin")
+        # Index into trip_ids of each departure
+        self.trips = map_array(directory / "trips.bin")
+
+    def has_line(self, line: MbtaLine, day: date) -> bool:
+        """Return if the index has departures for this line, and is recent enough to cover the given day."""
+        return line_key(line) in self.groups and day <= self.end_date
+
+    def departures(self, line: MbtaLine, start: datetime, end: datetime) -> list[tuple[datetime, str]]:
+        """Return the (departure time, trip id) of every departure of a line between two local times, in order."""
+        groups = self.groups.get(line_key(line), {})
+        results = []
+
+        # Trips after midnight belong to the previous day's service, with times past 24:00
+        for service_date in (start.date() - timedelta(days=1), start.date()):
+            service_start = datetime.combine(service_date, time())
+            lo = (start - service_start).total_seconds()
+            hi = (end - service_start).total_seconds()
+
+            for service_id, (offset, count) in groups.items():
+                if not self.services[service_id].is_active(service_date):
+                    continue
+
+                times = self.times[offset : offset + count]
+                for i in range(bisect.bisect_left(times, lo), count):
+                    if times[i] > hi:
+                        break
+                    departure_time = service_start + timedelta(seconds=times[i])
+                    results.append((departure_time, self.trip_ids[self.trips[offset + i]]))
+
+        results.sort()
+        return results
+
+
+def read_csv(feed: zipfile.ZipFile, name: str) -> Iterator[dict[str, str]]:
+    if name not in feed.namelist():
+        return
+    with feed.open(name) as f:
+        yield from csv.DictReader(io.TextIOWrapper(f, encoding="utf-8-sig", newline=""))
+
+
+def write_file(path: Path, write: Any) -> None:
+    """Write a file atomically, so running processes keep their mapping of the old one."""
+    with tempfile.NamedTemporaryFile("wb", dir=path.parent, delete=False) as f:
+        write(f)
+    os.replace(f.name, path)
+
+
+def import_feed(feed_file: IO[bytes] | Path, lines: list[MbtaLine], directory: Path) -> None:
+    """Build an index of the given lines' scheduled departures from a GTFS static feed zip."""
+    with zipfile.ZipFile(feed_file) as feed:
+        parent_stations = {row["stop_id"]: row["parent_station"] for row in read_csv(feed, "stops.txt")}
+
+        # trip id -> (service id, indices of the lines it serves)
+        trips: dict[str, tuple[str, list[int]]] = {}
+        for row in read_csv(feed, "trips.txt"):
+            line_indices = [
+                i
+                for i, line in enumerate(lines)
+                if line.route_id == row["route_id"] and str(line.direction_id) == row["direction_id"]
+            ]
+            if line_indices:
+                trips[row["trip_id"]] = (row["service_id"], line_indices)
+
+        # (line key, service id) -> [(departure seconds, trip id)]
+        departures: dict[tuple[str, str], list[tuple[int, str]]] = defaultdict(list)
+        for row in read_csv(feed, "stop_times.txt"):
+            if (trip := trips.get(row["trip_id"])) is None or not row["departure_time"]:
+                continue
+            # Like the API, skip stops with no pickups, e.g. the last one of a trip
+            if row.get("pickup_type") == "1":
+                continue
+
+            service_id, line_indices = trip
+            stop_ids = {row["stop_id"], parent_stations.get(row["stop_id"])}
+            for i in line_indices:
+                if lines[i].stop_id in stop_ids:
+                    departures[line_key(lines[i]), service_id].append(
+                        (parse_seconds(row["departure_time"]), row["trip_id"])
+                    )
+
+        used_services = {service_id for _, service_id in departures}
+        services: dict[str, dict[str, Any]] = {
+            service_id: {"weekdays": [False] * 7, "start": "99991231", "end": "00010101", "added": [], "removed": []}
+            for service_id in used_services
+        }
+        weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+        for row in read_csv(feed, "calendar.txt"):
+            if row["service_id"] in services:
+                services[row["service_id"]].update(
+                    weekdays=[row[day] == "1" for day in weekdays],
+                    start=row["start_date"],
+                    end=row["end_date"],
+                )
+        for row in read_csv(feed, "calendar_dates.txt"):
+            if row["service_id"] in services:
+                kind = "added" if row["exception_type"] == "1" else "removed"
+                services[row["service_id"]][kind].append(row["date"])
+
+        feed_version = next((row.get("feed_version") for row in read_csv(feed, "feed_info.txt")), None)
+
+    end_dates = [max([spec["end"], *spec["added"]]) for spec in services.values()]
+
+    times = array(ARRAY_TYPE)
+    trip_indices = array(ARRAY_TYPE)
+    trip_ids: dict[str, int] = {}
+    groups: dict[str, dict[str, tuple[int, int]]] = defaultdict(dict)
+    for (key, service_id), group in sorted(departures.items()):
+        group.sort()
+        groups[key][service_id] = (len(times), len(group))
+        for seconds, trip_id in group:
+            times.append(seconds)
+            trip_indices.append(trip_ids.setdefault(trip_id, len(trip_ids)))
+
+    directory.mkdir(parents=True, exist_ok=True)
+    write_file(directory / "times.bin", times.tofile)
+    write_file(directory / "trips.bin", trip_indices.tofile)
+    # Written last, so an interrupted import never leaves an index pointing past the end of its arrays
+    index = {
+        "version": INDEX_VERSION,
+        "byteorder": sys.byteorder,
+        "feed_version": feed_version,
+        "end_date": max(end_dates, default="00010101"),
+        "services": services,
+        "trip_ids": list(trip_ids),
+        "groups": groups,
+    }
+    write_file(directory / "index.json", lambda f: f.write(json.dumps(index).encode()))
+
+    logger.info("Indexed %d departures for %d lines from GTFS feed %s", len(times), len(groups), feed_version)
+
+
+def default_index_dir() -> Path:
+    return default_data_dir() / "gtfs"
+
+
+_gtfs_index_instance: GtfsIndex | None = None
+_gtfs_index_loaded = False
+
+
+def get_gtfs_index() -> GtfsIndex | None:
+    """Get the global GTFS index, or None if none has been imported."""
+    global _gtfs_index_instance, _gtfs_index_loaded
+    if not _gtfs_index_loaded:
+        _gtfs_index_loaded = True
+        directory = default_index_dir()
+        try:
+            _gtfs_index_instance = GtfsIndex(directory)
+        except FileNotFoundError:
+            logger.info("No GTFS index in %s, using the MBTA API for schedules", directory)
+        except Exception as e:
+            logger.warning("Can't load GTFS index from %s, using the MBTA API for schedules: %s", directory, e)
+    return _gtfs_index_instance
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="matrix.gtfs", description="Import the MBTA GTFS static feed")
+    parser.add_argument("--feed", default=MBTA_GTFS_URL, help="path or URL of the GTFS zip")
+    parser.add_argument("--output", type=Path, help="directory to write the index to")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    lines = get_config().screens.mbta.lines
+    output = args.output or default_index_dir()
+    # Checked before downloading the feed. On the Pi, the default data directory belongs to root
+    try:
+        output.mkdir(parents=True, exist_ok=True)
+        writable = os.access(output, os.W_OK)
+    except PermissionError:
+        writable = False
+    if not writable:
+        parser.error(f"can't write to {output}: run as root (e.g. with sudo), or choose another --output")
+
+    if args.feed.startswith(("http://", "https://")):
+        with tempfile.TemporaryFile() as f:
+            with requests.get(args.feed, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+            import_feed(f, lines, output)
+    else:
+        import_feed(Path(args.feed), lines, output)
@@ -0,0 +1,3 @@
+from matrix.gtfs import main
+
+main()
@@ -5,6 +5,7 @@ from PIL import Image, ImageDraw
 from matrix.modes.mode import BaseMode, ChangeMode, ModeType
 from matrix.resources.fonts import bigfont, font
 from matrix.utils.config import PanelSize, get_panel_size
+from matrix.utils.text import draw_text
 
 if TYPE_CHECKING:
     from matrix.utils.hardware import Hardware
@@ -19,6 +20,9 @@ class Brightness(BaseMode):
         super().__init__(change_mode)
         self.matrix = hardware.matrix
 
+    def next_update(self) -> float | None:
+        return None
+
     def handle_encoder_push(self):
         self.change_mode(ModeType.MAIN)
 
@@ -48,12 +52,13 @@ class Brightness(BaseMode):
         image = get_panel_size().empty_image()
         draw = ImageDraw.Draw(image)
 
-        draw.text((2, 1), text=" Brightness ", font=font, fill="#888888")
+        draw_text(draw, (2, 1), " Brightness ", font=font, fill="#888888")
         draw.line((0, 8, 64, 8), fill="#888888")
 
-        draw.text(
+        draw_text(
+            draw,
             (32 - 3 * len(f"{self.brightness}%"), 16),
-            text=f"{self.brightness}%",
+            f"{self.brightness}%",
             font=bigfont,
             fill="#ffffff",
         )
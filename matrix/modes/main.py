@@ -8,6 +8,7 @@ from typing import Any
 from matrix.modes.mode import BaseMode, ChangeMode, ModeType
 from matrix.screens.fish import MakeAFish
 from matrix.screens.screen import Screen
+from matrix.utils.schedule import next_minute
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ class Main(BaseMode):
         self.screen_index: int = 0
 
         self.fish: MakeAFish | None = None
+        self.current_screen: Screen[Any] | None = None
         self.next_refresh_time = time.time() + self.screen_refresh_rate
 
     def handle_encoder_clockwise(self):
@@ -43,6 +45,8 @@ class Main(BaseMode):
         if is_eleven_eleven():
             if self.fish is None:
                 self.fish = MakeAFish()
+                self.fish.start()
+            self.set_current_screen(self.fish)
             return self.fish.get_image()
         elif self.fish:
             self.fish.cancel()
@@ -61,8 +65,32 @@ class Main(BaseMode):
 
             try:
                 if result := screen.get_image():
+                    self.set_current_screen(screen, active_screens)
+                    screen.draw_data_age(result)
                     return result
             except Exception as e:
                 logger.exception("Exception drawing image for %s: %s", screen.__class__.__name__, e)
 
             self.screen_index += 1
+
+    def set_current_screen(self, screen: Screen[Any], active_screens: list[Screen[Any]] | None = None) -> None:
+        """Track which screen is shown, so that only it and the next one in the rotation fetch data."""
+        if screen is self.current_screen:
+            return
+
+        if self.current_screen is not None:
+            self.current_screen.set_visible(False)
+        screen.set_visible(True)
+        self.current_screen = screen
+
+        if active_screens:
+            upcoming = active_screens[(self.screen_index + 1) % len(active_screens)]
+            if upcoming is not screen:
+                upcoming.prefetch(self.next_refresh_time)
+
+    def next_update(self) -> float | None:
+        # Check for 11:11 at every minute, and rotate to the next screen on time
+        deadlines = [next_minute(), self.next_refresh_time]
+        if self.current_screen is not None and (screen_deadline := self.current_screen.next_update()) is not None:
+            deadlines.append(screen_deadline)
+        return min(deadlines)
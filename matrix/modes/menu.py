@@ -6,6 +6,7 @@ from PIL import Image, ImageDraw
 from matrix.modes.mode import BaseMode, ChangeMode, ModeType
 from matrix.resources.fonts import font
 from matrix.utils.config import get_panel_size
+from matrix.utils.text import draw_text
 
 
 @dataclass
@@ -30,6 +31,9 @@ class Menu(BaseMode):
 
         self.selected_option: int = 0  # which option is selected
 
+    def next_update(self) -> float | None:
+        return None
+
     def handle_encoder_push(self):
         self.change_mode(self.options[self.selected_option].next_mode)
 
@@ -43,14 +47,14 @@ class Menu(BaseMode):
         image = get_panel_size().empty_image()
         draw = ImageDraw.Draw(image)
 
-        draw.text((0, 1), text="  Settings   ", font=font, fill="#ffffff")
+        draw_text(draw, (0, 1), "  Settings   ", font=font, fill="#ffffff")
         draw.line((0, 8, 64, 8), fill="#888888")
 
         # TODO: draw options shorter or implement scrolling
         for i, option in enumerate(self.options):
             color = "#ffffff" if self.selected_option == i else "#888888"
-            draw.text((1, 12 + 10 * i), text=">", font=font, fill=color)
-            draw.text((12, 12 + 10 * i), text=option.name, font=font, fill=color)
+            draw_text(draw, (1, 12 + 10 * i), ">", font=font, fill=color)
+            draw_text(draw, (12, 12 + 10 * i), option.name, font=font, fill=color)
 
         draw.rectangle(
             (0, 10 + 10 * self.selected_option, 63, 10 + 10 * self.selected_option + 9),
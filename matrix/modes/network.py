@@ -1,22 +1,37 @@
+import functools
 import subprocess
 from typing import NamedTuple
 
-import qrcode
 from PIL import Image, ImageDraw
 
 from matrix.modes.mode import BaseMode, ChangeMode, ModeType
 from matrix.resources.fonts import font
 from matrix.utils.config import get_panel_size
-from matrix.utils.line_wrap import line_wrap
+from matrix.utils.text import draw_text
+from matrix.utils.ticker import Ticker
 
 
 class Network(BaseMode):
-    def __init__(self, change_mode: ChangeMode) -> None:
+    def __init__(self, change_mode: ChangeMode, network_info: "NetworkInfo | None" = None) -> None:
         super().__init__(change_mode)
-        self.network_info = get_network_info()
+        if network_info is not None:
+            self.network_info = network_info
 
         self.show_qr_code = False
 
+        # Long SSIDs scroll rather than wrapping
+        self.ssid_ticker = Ticker(63, font, "#ffffff")
+
+    @functools.cached_property
+    def network_info(self) -> "NetworkInfo":
+        # Looked up when the mode is first shown rather than at startup, since it runs iw and opens a socket
+        return get_network_info()
+
+    def next_update(self) -> float | None:
+        if self.show_qr_code:
+            return None
+        return self.ssid_ticker.next_update()
+
     def handle_encoder_push(self):
         self.change_mode(ModeType.MAIN)
 
@@ -31,6 +46,8 @@ class Network(BaseMode):
         draw = ImageDraw.Draw(image)
 
         if self.show_qr_code:
+            import qrcode
+
             qr = qrcode.QRCode(
                 version=1,
                 error_correction=qrcode.ERROR_CORRECT_L,
@@ -46,20 +63,19 @@ class Network(BaseMode):
             image.paste(img.get_image(), (padding, padding))
 
         else:
-            draw.text((2, 1), text="Network Info", font=font, fill="#ffffff")
+            draw_text(draw, (2, 1), "Network Info", font=font, fill="#ffffff")
             draw.line((0, 8, 64, 8), fill="#888888")
 
-            draw.text((1, 12), text="SSID", font=font, fill="#888888")
+            draw_text(draw, (1, 12), "SSID", font=font, fill="#888888")
 
-            line_y = 20
-            for line in line_wrap(self.network_info.ssid, max_width=12):
-                draw.text((1, line_y), text=line, font=font, fill="#ffffff")
-                line_y += 8
-            line_y += 2
-            draw.text((1, line_y), text="IP Address", font=font, fill="#888888")
-            draw.text(
+            self.ssid_ticker.set_text(self.network_info.ssid)
+            self.ssid_ticker.draw(image, (1, 20))
+            line_y = 30
+            draw_text(draw, (1, line_y), "IP Address", font=font, fill="#888888")
+            draw_text(
+                draw,
                 (1, line_y + 8),
-                text=self.network_info.ip_addr,
+                self.network_info.ip_addr,
                 font=font,
                 fill="#ffffff",
             )
@@ -73,20 +89,19 @@ class Network(BaseMode):
         image = get_panel_size().empty_image()
         draw = ImageDraw.Draw(image)
 
-        draw.text((2, 1), text="Network Info", font=font, fill="#ffffff")
+        draw_text(draw, (2, 1), "Network Info", font=font, fill="#ffffff")
         draw.line((0, 8, 64, 8), fill="#888888")
 
-        draw.text((1, 12), text="SSID", font=font, fill="#888888")
+        draw_text(draw, (1, 12), "SSID", font=font, fill="#888888")
 
-        line_y = 20
-        for line in line_wrap(self.network_info.ssid, max_width=12):
-            draw.text((1, line_y), text=line, font=font, fill="#ffffff")
-            line_y += 8
-        line_y += 2
-        draw.text((1, line_y), text="IP Address", font=font, fill="#888888")
-        draw.text(
+        self.ssid_ticker.set_text(self.network_info.ssid)
+        self.ssid_ticker.draw(image, (1, 20))
+        line_y = 30
+        draw_text(draw, (1, line_y), "IP Address", font=font, fill="#888888")
+        draw_text(
+            draw,
             (1, line_y + 8),
-            text=self.network_info.ip_addr,
+            self.network_info.ip_addr,
             font=font,
             fill="#ffffff",
         )
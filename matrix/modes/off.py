@@ -8,3 +8,6 @@ class Off(BaseMode):
 
     def get_image(self):
         return get_panel_size().empty_image()
+
+    def next_update(self) -> float | None:
+        return None
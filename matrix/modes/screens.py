@@ -7,6 +7,8 @@ from matrix.resources.colors import BLUE, GREEN, LIGHT_GREY, WHITE
 from matrix.resources.fonts import font
 from matrix.screens.screen import Screen
 from matrix.utils.config import get_panel_size
+from matrix.utils.text import draw_text
+from matrix.utils.ticker import Ticker
 
 
 class Screens(BaseMode):
@@ -16,10 +18,18 @@ class Screens(BaseMode):
         self.selected_option: int = 0
         self.total_options = len(self.screens) + 1  # +1 for the "back" option
 
+        # The selected screen's name scrolls if it's too long to fit
+        self.label_ticker = Ticker(51, font, WHITE)
+
     @property
     def is_back_selected(self) -> bool:
         return self.selected_option == self.total_options - 1
 
+    def next_update(self) -> float | None:
+        if self.is_back_selected:
+            return None
+        return self.label_ticker.next_update()
+
     def handle_encoder_push(self):
         if self.is_back_selected:
             self.change_mode(ModeType.MENU)
@@ -33,11 +43,10 @@ class Screens(BaseMode):
         self.selected_option = (self.selected_option - 1) % self.total_options
 
     def get_image(self) -> Image.Image:
-        # TODO: make sure everything can fit or implement scrolling?
         image = get_panel_size().empty_image()
         draw = ImageDraw.Draw(image)
 
-        draw.text((0, 1), text="   Screens   ", font=font, fill=WHITE)
+        draw_text(draw, (0, 1), "   Screens   ", font=font, fill=WHITE)
 
         # back arrow
         arrow_middle_y = 5
@@ -57,12 +66,11 @@ class Screens(BaseMode):
                 draw.line((3, 18 + 10 * i, 2, 17 + 10 * i), fill=WHITE)
                 draw.line((3, 18 + 10 * i, 7, 14 + 10 * i), fill=WHITE)
 
-            draw.text(
-                (12, 14 + 10 * i),
-                text=screen.__class__.__name__,
-                font=font,
-                fill=(WHITE if self.selected_option == i else LIGHT_GREY),
-            )
+            if self.selected_option == i:
+                self.label_ticker.set_text(screen.__class__.__name__)
+                self.label_ticker.draw(image, (12, 14 + 10 * i))
+            else:
+                draw_text(draw, (12, 14 + 10 * i), screen.__class__.__name__, font=font, fill=LIGHT_GREY)
 
         if self.is_back_selected:
             draw.rectangle((0, 0, 10, 10), outline=BLUE)
@@ -0,0 +1,4 @@
+from pathlib import Path
+
+# fonts/ and icons/ sit next to the matrix package, so they're found from any working directory
+ASSETS_DIR = Path(__file__).resolve().parents[2]
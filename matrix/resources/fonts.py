@@ -1,5 +1,29 @@
+import functools
+from pathlib import Path
+from typing import Any
+
 from PIL import ImageFont
 
-smallfont = ImageFont.load("fonts/4x6.pil")
-font = ImageFont.load("fonts/5x7.pil")
-bigfont = ImageFont.load("fonts/6x13.pil")
+from matrix.resources import ASSETS_DIR
+
+FONTS_DIR = ASSETS_DIR / "fonts"
+
+
+class LazyFont(ImageFont.ImageFont):
+    """A bitmap font that is only read from disk when it's first drawn or measured."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @functools.cached_property
+    def loaded(self) -> ImageFont.ImageFont:
+        return ImageFont.load(str(self.path))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes set by loading, e.g. the glyph data used by getmask()
+        return getattr(self.loaded, name)
+
+
+smallfont = LazyFont(FONTS_DIR / "4x6.pil")
+font = LazyFont(FONTS_DIR / "5x7.pil")
+bigfont = LazyFont(FONTS_DIR / "6x13.pil")
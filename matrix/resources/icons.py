@@ -0,0 +1,32 @@
+import functools
+from dataclasses import dataclass
+
+from PIL import Image
+
+from matrix.resources import ASSETS_DIR
+
+ICONS_DIR = ASSETS_DIR / "icons"
+
+
+@dataclass(frozen=True, slots=True)
+class Icon:
+    """An icon decoded and converted to RGB once, ready to paste onto a frame."""
+
+    image: Image.Image
+    # Alpha channel of icons with transparent pixels, None if fully opaque
+    mask: Image.Image | None
+
+    def paste(self, image: Image.Image, xy: tuple[int, int]) -> None:
+        image.paste(self.image, xy, self.mask)
+
+
+@functools.cache
+def load_icon(name: str) -> Icon:
+    """Load an icon by its path under icons/ without the extension, e.g. "bike" or "weather/16px/sun"."""
+    with Image.open(ICONS_DIR / f"{name}.png") as file:
+        if file.mode in ("RGBA", "LA") or "transparency" in file.info:
+            rgba = file.convert("RGBA")
+            mask = rgba.getchannel("A")
+            is_opaque = mask.getextrema() == (255, 255)
+            return Icon(rgba.convert("RGB"), None if is_opaque else mask)
+        return Icon(file.convert("RGB"), None)
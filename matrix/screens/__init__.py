@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from matrix.screens.screen import Screen
+
+# Screens that can be listed in the rotation in matrix.toml, as "module:class". They're only
+# imported once listed, so unused screens don't load their dependencies, e.g. spotipy.
+SCREENS: dict[str, str] = {
+    "mbta": "matrix.screens.mbta:MBTA",
+    "spotify": "matrix.screens.spotify:Spotify",
+    "weather": "matrix.screens.weather:Weather",
+    "forecast": "matrix.screens.forecast:Forecast",
+    "bluebikes": "matrix.screens.bluebikes:BlueBikes",
+    "octoprint": "matrix.screens.octoprint:Octoprint",
+}
+
+
+def create_screen(name: str) -> "Screen[Any]":
+    """Import and create the screen with the given name."""
+    module_name, class_name = SCREENS[name].split(":")
+    # __import__ rather than importlib.import_module(), so that --profile-startup times it
+    screen_class = getattr(__import__(module_name, fromlist=[class_name]), class_name)
+    return screen_class()
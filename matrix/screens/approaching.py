@@ -5,6 +5,7 @@ from PIL import ImageDraw
 from matrix.resources.fonts import font
 from matrix.screens.screen import Screen
 from matrix.utils.panels import PanelSize
+from matrix.utils.text import draw_text
 
 EVENTS: dict[PanelSize, list[tuple[str, datetime.timedelta]]] = {
     PanelSize.PANEL_64x64: [
@@ -26,7 +27,7 @@ EVENTS: dict[PanelSize, list[tuple[str, datetime.timedelta]]] = {
 
 
 class Approaching(Screen[None]):
-    def fetch_data(self) -> None:
+    async def fetch_data(self) -> None:
         return None
 
     def fallback_data(self):
@@ -37,12 +38,12 @@ class Approaching(Screen[None]):
         draw = ImageDraw.Draw(image)
 
         time_str = datetime.datetime.now().strftime("%H:%M")
-        draw.text((39, 1), f"{time_str:>5}", font=font, fill="#FFAA00")
+        draw_text(draw, (39, 1), f"{time_str:>5}", font=font, fill="#FFAA00")
 
         for i, (label, wait) in list(enumerate(EVENTS[self.size])):
             time_str = str(int(wait / datetime.timedelta(minutes=1)))
-            draw.text((1, 12 + 9 * i), f"{label:<8}", font=font, fill="#FFAA00")
-            draw.text((47, 12 + 9 * i), f"{time_str:>2}", font=font, fill="#FFAA00")
-            draw.text((59, 12 + 9 * i), "m", font=font, fill="#FFAA00")
+            draw_text(draw, (1, 12 + 9 * i), f"{label:<8}", font=font, fill="#FFAA00")
+            draw_text(draw, (47, 12 + 9 * i), f"{time_str:>2}", font=font, fill="#FFAA00")
+            draw_text(draw, (59, 12 + 9 * i), "m", font=font, fill="#FFAA00")
 
         return image
@@ -1,147 +1,144 @@
 import datetime
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, TypeAlias
 
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, ImageFont
 
 from matrix.resources.fonts import font, smallfont
+from matrix.resources.icons import load_icon
 from matrix.screens.screen import Screen
 from matrix.utils.config import get_config
+from matrix.utils.gbfs import GbfsClient
+from matrix.utils.text import draw_text
 
+# Station information hardly ever changes, so it's only refreshed this often, rather than on its ttl
+STATION_INFORMATION_INTERVAL = 24 * 60 * 60
 
-class BlueBikes(Screen[tuple[Any, Any] | None]):
+
+@dataclass(slots=True)
+class StationStatus:
+    bikes: int
+    ebikes: int
+    docks: int
+
+
+# Status of each configured station that is in the feeds, by short name
+BlueBikesData: TypeAlias = dict[str, StationStatus] | None
+
+
+def get_station_ids(station_information: Any, short_names: Iterable[str]) -> dict[str, str]:
+    """Map the station_id of each of the given stations to its short name."""
+    wanted = set(short_names)
+    return {
+        station["station_id"]: station["short_name"]
+        for station in station_information["data"]["stations"]
+        if station.get("short_name") in wanted
+    }
+
+
+def index_statuses(station_status: Any, station_ids: dict[str, str]) -> dict[str, StationStatus]:
+    """Pick the given stations out of the status feed, so that nothing else from it has to be kept."""
+    return {
+        station_ids[status["station_id"]]: StationStatus(
+            bikes=status["num_bikes_available"],
+            ebikes=status.get("num_ebikes_available", 0),
+            docks=status["num_docks_available"],
+        )
+        for status in station_status["data"]["stations"]
+        if status["station_id"] in station_ids
+    }
+
+
+def index_stations(
+    station_information: Any, station_status: Any, short_names: Iterable[str]
+) -> dict[str, StationStatus]:
+    return index_statuses(station_status, get_station_ids(station_information, short_names))
+
+
+class BlueBikes(Screen[BlueBikesData]):
     CACHE_TTL = 60
+    DATA_VERSION = 2
 
     def __init__(self) -> None:
-        self.stations = {sta.id: sta.label for sta in get_config().screens.bluebikes.stations}
+        config = get_config().screens.bluebikes
+        self.stations = {sta.id: sta.label for sta in config.stations}
         super().__init__()
 
-    def fetch_data(self):
-        with ThreadPoolExecutor() as tpe:
-            all_stations_future = tpe.submit(
-                self.fetch_url,
-                "https://gbfs.lyft.com/gbfs/1.1/bos/en/station_information.json",
-            )
-            all_statuses_future = tpe.submit(
-                self.fetch_url,
-                "https://gbfs.lyft.com/gbfs/1.1/bos/en/station_status.json",
-            )
+        self.gbfs = GbfsClient(self.engine, config.gbfs_url, config.language)
+        # station_id -> short name of the configured stations, and when it was last refreshed
+        self.station_ids: dict[str, str] | None = None
+        self.station_ids_updated = 0.0
 
-        return all_stations_future.result().json(), all_statuses_future.result().json()
+    async def fetch_data(self):
+        # The feeds cover the whole system, so they aren't kept around once the stations are picked out
+        if self.station_ids is None or time.time() - self.station_ids_updated > STATION_INFORMATION_INTERVAL:
+            station_information = await self.gbfs.get_feed("station_information", keep_decoded=False)
+            self.station_ids = get_station_ids(station_information, self.stations)
+            self.station_ids_updated = time.time()
+
+        # Served from the HTTP cache without a request while the last one is within its ttl
+        station_status = await self.gbfs.get_feed("station_status", keep_decoded=False)
+        return index_statuses(station_status, self.station_ids)
 
     def fallback_data(self):
         return None
 
-    def get_image_64x64(self):
-        image = Image.new("RGB", (64, 64))
+    def draw_stations(
+        self,
+        image: Image.Image,
+        label_y: int,
+        icons_y: int,
+        row_height: int,
+        label_font: ImageFont.ImageFont,
+    ) -> None:
         draw = ImageDraw.Draw(image)
-
-        time_str = datetime.datetime.now().strftime("%H:%M")
-        draw.text((1, 1), "Bikes", font=font, fill="#2CA3E1")
-        draw.text((39, 1), f"{time_str:>5}", font=font, fill="#2CA3E1")
-
-        if self.data is None:
-            time_str = datetime.datetime.now().strftime("%H:%M")
-
-            for i, sta_id in enumerate(self.stations):
-                draw.text((1, 10 + 18 * i), text=self.stations[sta_id], font=font, fill="#999999")
-                image.paste(Image.open("icons/bike.png"), (1, 18 + 18 * i))
-                draw.text((12, 19 + 18 * i), text="??", font=font, fill="#2CA3E1")
-                image.paste(Image.open("icons/ebike.png"), (25, 18 + 18 * i))
-                draw.text((31, 19 + 18 * i), text="??", font=font, fill="#b6d3d4")
-                image.paste(Image.open("icons/parking.png"), (45, 18 + 18 * i))
-                draw.text((53, 19 + 18 * i), text="??", font=font, fill="#4254f5")
-
-            return image
-
-        all_stations, all_status = self.data
-
-        guids = {}
-        for sta_id in self.stations:
-            sta_info = next(s for s in all_stations["data"]["stations"] if s["short_name"] == sta_id)
-            guids[sta_id] = sta_info["station_id"]
-
-        status = {}
-        for sta_id in self.stations:
-            sta_status = next(s for s in all_status["data"]["stations"] if s["station_id"] == guids[sta_id])
-            status[sta_id] = sta_status
-
-        for i, (sta_id, info) in enumerate(status.items()):
-            draw.text((1, 10 + 18 * i), text=self.stations[sta_id], font=font, fill="#999999")
-            image.paste(Image.open("icons/bike.png"), (1, 18 + 18 * i))
-            draw.text(
-                (12, 19 + 18 * i),
-                text=f"{info['num_bikes_available']:0>2}",
+        data = self.data or {}
+
+        for i, (sta_id, label) in enumerate(self.stations.items()):
+            y = icons_y + row_height * i
+            status = data.get(sta_id)
+
+            draw_text(draw, (1, label_y + row_height * i), label, font=label_font, fill="#999999")
+            load_icon("bike").paste(image, (1, y))
+            draw_text(
+                draw,
+                (12, y + 1),
+                f"{status.bikes:0>2}" if status else "??",
                 font=font,
                 fill="#2CA3E1",
             )
-            image.paste(Image.open("icons/ebike.png"), (25, 18 + 18 * i))
-            draw.text(
-                (31, 19 + 18 * i),
-                text=f"{info['num_ebikes_available']:0>2}",
+            load_icon("ebike").paste(image, (25, y))
+            draw_text(
+                draw,
+                (31, y + 1),
+                f"{status.ebikes:0>2}" if status else "??",
                 font=font,
                 fill="#b6d3d4",
             )
-            image.paste(Image.open("icons/parking.png"), (45, 18 + 18 * i))
-            draw.text(
-                (53, 19 + 18 * i),
-                text=f"{info['num_docks_available']:0>2}",
+            load_icon("parking").paste(image, (45, y))
+            draw_text(
+                draw,
+                (53, y + 1),
+                f"{status.docks:0>2}" if status else "??",
                 font=font,
                 fill="#4254f5",
             )
 
+    def get_image_64x64(self):
+        image = Image.new("RGB", (64, 64))
+        draw = ImageDraw.Draw(image)
+
+        time_str = datetime.datetime.now().strftime("%H:%M")
+        draw_text(draw, (1, 1), "Bikes", font=font, fill="#2CA3E1")
+        draw_text(draw, (39, 1), f"{time_str:>5}", font=font, fill="#2CA3E1")
+
+        self.draw_stations(image, label_y=10, icons_y=18, row_height=18, label_font=font)
+
         return image
 
     def get_image_64x32(self):
         image = Image.new("RGB", (64, 32))
-        draw = ImageDraw.Draw(image)
-
-        if self.data is None:
-            for i, sta_id in enumerate(self.stations):
-                draw.text((1, 1 + 16 * i), text=self.stations[sta_id], font=font, fill="#999999")
-                image.paste(Image.open("icons/bike.png"), (1, 8 + 16 * i))
-                draw.text((12, 9 + 16 * i), text="??", font=font, fill="#2CA3E1")
-                image.paste(Image.open("icons/ebike.png"), (25, 8 + 16 * i))
-                draw.text((31, 9 + 16 * i), text="??", font=font, fill="#b6d3d4")
-                image.paste(Image.open("icons/parking.png"), (45, 8 + 16 * i))
-                draw.text((53, 9 + 16 * i), text="??", font=font, fill="#4254f5")
-
-            return image
-
-        all_stations, all_status = self.data
-
-        guids = {}
-        for sta_id in self.stations:
-            sta_info = next(s for s in all_stations["data"]["stations"] if s["short_name"] == sta_id)
-            guids[sta_id] = sta_info["station_id"]
-
-        status = {}
-        for sta_id in self.stations:
-            sta_status = next(s for s in all_status["data"]["stations"] if s["station_id"] == guids[sta_id])
-            status[sta_id] = sta_status
-
-        for i, (sta_id, info) in enumerate(status.items()):
-            draw.text((1, 1 + 16 * i), text=self.stations[sta_id], font=smallfont, fill="#999999")
-            image.paste(Image.open("icons/bike.png"), (1, 8 + 16 * i))
-            draw.text(
-                (12, 9 + 16 * i),
-                text=f"{info['num_bikes_available']:0>2}",
-                font=font,
-                fill="#2CA3E1",
-            )
-            image.paste(Image.open("icons/ebike.png"), (25, 8 + 16 * i))
-            draw.text(
-                (31, 9 + 16 * i),
-                text=f"{info['num_ebikes_available']:0>2}",
-                font=font,
-                fill="#b6d3d4",
-            )
-            image.paste(Image.open("icons/parking.png"), (45, 8 + 16 * i))
-            draw.text(
-                (53, 9 + 16 * i),
-                text=f"{info['num_docks_available']:0>2}",
-                font=font,
-                fill="#4254f5",
-            )
-
+        self.draw_stations(image, label_y=1, icons_y=8, row_height=16, label_font=smallfont)
         return image
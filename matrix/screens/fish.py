@@ -2,41 +2,47 @@ import io
 import subprocess
 from typing import assert_never
 
-from cairosvg import svg2png
 from PIL import Image, ImageDraw
 
+from matrix.resources import ASSETS_DIR
 from matrix.resources.fonts import font
 from matrix.screens.screen import Screen
 from matrix.utils.bun import find_bun
 from matrix.utils.config import get_config
+from matrix.utils.text import draw_text
 
 
 class MakeAFish(Screen[tuple[Image.Image, Image.Image]]):
     CACHE_TTL = 5
 
-    def fetch_data(self):
-        provider = get_config().screens.fish.provider
-        match provider:
-            case "amy":
-                svg = subprocess.run(
-                    [find_bun(), "scripts/amy_fish.js"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                ).stdout
-                data = svg2png(bytestring=svg.encode("utf-8"))
+    def make_amy_fish(self) -> tuple[Image.Image, Image.Image]:
+        # Only needed for this provider, and slow to import
+        from cairosvg import svg2png
+
+        svg = subprocess.run(
+            [find_bun(), ASSETS_DIR / "scripts" / "amy_fish.js"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        data = svg2png(bytestring=svg.encode("utf-8"))
+
+        if not data:
+            raise ValueError("No data returned from fish SVG conversion")
 
-                if not data:
-                    raise ValueError("No data returned from fish SVG conversion")
+        fish_64x48 = Image.open(io.BytesIO(data))
+        fish_64x32 = fish_64x48.resize((64, 32))
 
-                fish_64x48 = Image.open(io.BytesIO(data))
-                fish_64x32 = fish_64x48.resize((64, 32))
+        return fish_64x48, fish_64x32
 
-                return fish_64x48, fish_64x32
+    async def fetch_data(self):
+        provider = get_config().screens.fish.provider
+        match provider:
+            case "amy":
+                return await self.engine.run(self.make_amy_fish)
             case "makeafish":
-                data = self.fetch_url(
-                    "http://makea.fish/fishimg.php?s=11&t=x6362x&f=11",
-                ).content
+                response = await self.fetch_url("http://makea.fish/fishimg.php?s=11&t=x6362x&f=11")
+                data = response.content
                 fish = Image.open(io.BytesIO(data))
 
                 fish_64x64 = fish.copy()
@@ -55,6 +61,9 @@ class MakeAFish(Screen[tuple[Image.Image, Image.Image]]):
 
         return blank_64x64, blank_64x32
 
+    def next_update(self) -> float | None:
+        return None
+
     def get_image_64x64(self):
         image = self.size.empty_image()
         draw = ImageDraw.Draw(image)
@@ -65,11 +74,11 @@ class MakeAFish(Screen[tuple[Image.Image, Image.Image]]):
 
         match get_config().screens.fish.provider:
             case "amy":
-                draw.text((5, 48), text="11:11 make", font=font, fill="#ffffff")
-                draw.text((5, 56), text="an Amy fish", font=font, fill="#ffffff")
+                draw_text(draw, (5, 48), "11:11 make", font=font, fill="#ffffff")
+                draw_text(draw, (5, 56), "an Amy fish", font=font, fill="#ffffff")
             case "makeafish":
-                draw.text((20, 48), text="11:11", font=font, fill="#ffffff")
-                draw.text((5, 56), text="make a fish", font=font, fill="#ffffff")
+                draw_text(draw, (20, 48), "11:11", font=font, fill="#ffffff")
+                draw_text(draw, (5, 56), "make a fish", font=font, fill="#ffffff")
 
         return image
 
@@ -81,6 +90,6 @@ class MakeAFish(Screen[tuple[Image.Image, Image.Image]]):
 
         image.paste(self.data[1])
 
-        draw.text((39, 25), text="11:11", font=font, fill="#ffffff")
+        draw_text(draw, (39, 25), "11:11", font=font, fill="#ffffff")
 
         return image
@@ -1,10 +1,10 @@
 import datetime
-from pathlib import Path
 from typing import TypedDict
 
 from PIL import Image, ImageDraw
 
 from matrix.resources.fonts import font
+from matrix.resources.icons import load_icon
 from matrix.screens.screen import Screen
 from matrix.screens.weather import (
     HIGH_COLOR,
@@ -14,6 +14,8 @@ from matrix.screens.weather import (
     get_icon,
 )
 from matrix.utils.config import get_config
+from matrix.utils.data_sources import get_open_meteo
+from matrix.utils.text import draw_text
 
 PRECIP_COLOR = "#58a8f0"
 
@@ -33,19 +35,18 @@ class ForecastData(TypedDict):
 class Forecast(Screen[ForecastData | None]):
     CACHE_TTL = 1200
 
-    def fetch_data(self):
+    def __init__(self) -> None:
+        super().__init__()
         config = get_config().screens.forecast
-        url = (
-            "https://api.open-meteo.com/v1/forecast"
-            f"?latitude={config.latitude}&longitude={config.longitude}"
-            "&daily=weather_code,temperature_2m_max,"
-            "temperature_2m_min,precipitation_probability_max"
-            "&temperature_unit=celsius"
-            "&forecast_days=4"
-            "&timezone=auto"
+        assert config is not None  # Required by ScreensConfig when the screen is in the rotation
+        self.source = get_open_meteo(config.latitude, config.longitude)
+        self.source.subscribe(
+            daily=["weather_code", "temperature_2m_max", "temperature_2m_min", "precipitation_probability_max"],
+            forecast_days=4,
         )
 
-        return self.fetch_url(url).json()
+    async def fetch_data(self):
+        return await self.source.get(max_age=self.CACHE_TTL / 2)
 
     def fallback_data(self):
         return None
@@ -55,7 +56,7 @@ class Forecast(Screen[ForecastData | None]):
         draw = ImageDraw.Draw(image)
 
         # Top bar
-        draw.text((1, 1), "Forecast", font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (1, 1), "Forecast", font=font, fill=TIME_DATE_COLOR)
 
         if self.data is None:
             return image
@@ -73,25 +74,21 @@ class Forecast(Screen[ForecastData | None]):
             temp_min_f = int(c_to_f(daily["temperature_2m_min"][day_index]))
             precip = daily["precipitation_probability_max"][day_index]
 
-            draw.text((1, y), day_label, font=font, fill=TIME_DATE_COLOR)
+            draw_text(draw, (1, y), day_label, font=font, fill=TIME_DATE_COLOR)
 
-            precip_icon = Image.open(
-                Path.cwd() / "icons" / "weather" / "precip" / f"{int(round(precip / 20)) * 20}.png"
-            )
-            image.paste(precip_icon, (0, y + 8))
+            load_icon(f"weather/precip/{int(round(precip / 20)) * 20}").paste(image, (0, y + 8))
 
-            draw.text((7, y + 9), f"{precip:>2}%", font=font, fill=PRECIP_COLOR)
+            draw_text(draw, (7, y + 9), f"{precip:>2}%", font=font, fill=PRECIP_COLOR)
 
             wmo_code = daily["weather_code"][day_index]
             icon_name = get_icon(wmo_code, is_day=True)
             if icon_name is not None:
-                icon = Image.open(Path.cwd() / "icons" / "weather" / "16px" / f"{icon_name}.png")
-                image.paste(icon, (23, y))
+                load_icon(f"weather/16px/{icon_name}").paste(image, (23, y))
 
             draw.line((42, y + 3, 44, y + 1, 46, y + 3), fill=HIGH_COLOR)
-            draw.text((49, y), f"{temp_max_f}°", font=font, fill=HIGH_COLOR)
+            draw_text(draw, (49, y), f"{temp_max_f}°", font=font, fill=HIGH_COLOR)
             draw.line((42, y + 11, 44, y + 13, 46, y + 11), fill=LOW_COLOR)
-            draw.text((49, y + 9), f"{temp_min_f}°", font=font, fill=LOW_COLOR)
+            draw_text(draw, (49, y + 9), f"{temp_min_f}°", font=font, fill=LOW_COLOR)
 
         return image
 
@@ -100,7 +97,7 @@ class Forecast(Screen[ForecastData | None]):
         draw = ImageDraw.Draw(image)
 
         # Top bar
-        draw.text((1, 1), "Tomorrow", font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (1, 1), "Tomorrow", font=font, fill=TIME_DATE_COLOR)
 
         if self.data is None:
             return image
@@ -116,24 +113,20 @@ class Forecast(Screen[ForecastData | None]):
         temp_min_f = int(c_to_f(daily["temperature_2m_min"][day_index]))
         precip = daily["precipitation_probability_max"][day_index]
 
-        draw.text((1, 10), day_label, font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (1, 10), day_label, font=font, fill=TIME_DATE_COLOR)
 
-        precip_icon = Image.open(
-            Path.cwd() / "icons" / "weather" / "precip" / f"{int(round(precip / 100 * 5)) * 20}.png"
-        )
-        image.paste(precip_icon, (0, 18))
+        load_icon(f"weather/precip/{int(round(precip / 100 * 5)) * 20}").paste(image, (0, 18))
 
-        draw.text((7, 19), f"{precip:>2}%", font=font, fill=PRECIP_COLOR)
+        draw_text(draw, (7, 19), f"{precip:>2}%", font=font, fill=PRECIP_COLOR)
 
         wmo_code = daily["weather_code"][day_index]
         icon_name = get_icon(wmo_code, is_day=True)
         if icon_name is not None:
-            icon = Image.open(Path.cwd() / "icons" / "weather" / "16px" / f"{icon_name}.png")
-            image.paste(icon, (23, 10))
+            load_icon(f"weather/16px/{icon_name}").paste(image, (23, 10))
 
         draw.line((42, 13, 44, 11, 46, 13), fill=HIGH_COLOR)
-        draw.text((49, 10), f"{temp_max_f}°", font=font, fill=HIGH_COLOR)
+        draw_text(draw, (49, 10), f"{temp_max_f}°", font=font, fill=HIGH_COLOR)
         draw.line((42, 21, 44, 23, 46, 21), fill=LOW_COLOR)
-        draw.text((49, 19), f"{temp_min_f}°", font=font, fill=LOW_COLOR)
+        draw_text(draw, (49, 19), f"{temp_min_f}°", font=font, fill=LOW_COLOR)
 
         return image
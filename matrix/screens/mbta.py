@@ -1,78 +1,177 @@
+import asyncio
+import json
+import logging
 import re
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Literal, TypeAlias
 
-import requests
 from PIL import Image, ImageDraw
 
+from matrix.gtfs import get_gtfs_index
 from matrix.resources.fonts import font, smallfont
+from matrix.resources.icons import load_icon
 from matrix.screens.screen import Screen
-from matrix.utils.config import MbtaLine, get_config
+from matrix.utils.config import MbtaLine, PanelSize, get_config
+from matrix.utils.connectivity import CONNECTION_ERRORS, HostUnavailable
+from matrix.utils.data_store import MAX_DATA_AGE
+from matrix.utils.event_stream import EventStream
+from matrix.utils.fetch_engine import FetchEngine
+from matrix.utils.schedule import next_minute, request_redraw
+from matrix.utils.text import draw_text, text_length
+from matrix.utils.ticker import Ticker
+
+logger = logging.getLogger(__name__)
 
 PredictionType: TypeAlias = Literal["prediction", "schedule"]
 
 
-@dataclass
+# Color of countdowns for scheduled departures, rather than realtime predictions
+SCHEDULED_COLOR = "#888888"
+
+
+@dataclass(slots=True)
 class Prediction:
-    line: MbtaLine
-    eta: timedelta
+    # Naive local time, so the countdown can be worked out when drawing
+    departure_time: datetime
     type: PredictionType
+    # Color to draw the countdown in
+    fill: str
 
+    def minutes_until(self, now: datetime) -> int:
+        return int((self.departure_time - now) / timedelta(minutes=1))
 
-def get_predictions(session: requests.Session, line: MbtaLine, api_key: str) -> list[Prediction]:
-    predictions_response = session.get(
-        "https://api-v3.mbta.com/predictions",
-        params={
-            "filter[stop]": line.stop_id,
-            "filter[route]": line.route_id,
-            "filter[direction_id]": str(line.direction_id),
-            "include": "stop",
-            "sort": "arrival_time",
-            "page[limit]": "10",
-            "api_key": api_key,
-        },
-        timeout=15,
-    )
 
-    predictions_response.raise_for_status()
+API_URL = "https://api-v3.mbta.com"
 
-    predictions = predictions_response.json()["data"]
+# Number of departures to show per line
+MAX_PREDICTIONS = 6
+
+# How far ahead to look for scheduled departures
+SCHEDULE_WINDOW = timedelta(hours=2)
+
+
+@dataclass
+class ScheduledDeparture:
+    line: int  # index into the configured lines
+    trip_id: str
+    departure_time: datetime
+
+
+@dataclass
+class Departures:
+    """Raw predictions and schedules for every configured line, before they are split up by line."""
+
+    predictions: list[dict]
+    # Sorted by departure time
+    schedules: list[ScheduledDeparture]
+    # Parent station of each stop the predictions and schedules refer to
+    parent_stations: dict[str, str | None]
+
+
+def unique_ids(ids: list[str]) -> str:
+    """Join ids into a comma-separated filter value, which the V3 API accepts for most filters."""
+    return ",".join(dict.fromkeys(ids))
+
+
+def get_parent_station(stop: dict) -> str | None:
+    parent_station = stop.get("relationships", {}).get("parent_station", {}).get("data")
+    return parent_station["id"] if parent_station else None
+
+
+def get_parent_stations(response: dict) -> dict[str, str | None]:
+    """Map the stop ids in a response to their parent stations, from the included stops."""
+    return {stop["id"]: get_parent_station(stop) for stop in response.get("included", [])}
 
-    current_time = datetime.now()
 
-    results: list[Prediction] = []
+def prediction_params(lines: list[MbtaLine], api_key: str) -> dict[str, str]:
+    """Query parameters for the predictions of every line, used for both polling and streaming."""
+    return {
+        "filter[stop]": unique_ids([line.stop_id for line in lines]),
+        "filter[route]": unique_ids([line.route_id for line in lines]),
+        "include": "stop",
+        "sort": "arrival_time",
+        "fields[prediction]": "departure_time,direction_id",
+        "fields[stop]": "name",
+        "api_key": api_key,
+    }
+
+
+def match_line(item: dict, lines: list[MbtaLine], parent_stations: dict[str, str | None]) -> int | None:
+    """Return the index of the configured line a prediction or schedule belongs to, if any.
+
+    Batched requests return every combination of the requested stops and
+    routes, in both directions, so anything else is dropped here.
+    """
+    relationships = item["relationships"]
+    route_id = relationships["route"]["data"]["id"]
+    stop_id = relationships["stop"]["data"]["id"]
+    # Lines can be configured with a parent station, but predictions are for a platform
+    stop_ids = {stop_id, parent_stations.get(stop_id)}
+    direction_id = item["attributes"]["direction_id"]
+
+    for i, line in enumerate(lines):
+        if line.route_id == route_id and line.direction_id == direction_id and line.stop_id in stop_ids:
+            return i
+    return None
+
+
+def parse_time(value: str) -> datetime:
+    """Parse a time from the API into a naive local time."""
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").replace(tzinfo=None)
+
+
+def is_upcoming(departure_time: datetime, current_time: datetime) -> bool:
+    """Return if a departure is worth showing."""
+    return timedelta(minutes=0) < departure_time - current_time < timedelta(minutes=100)
+
+
+def build_predictions(lines: list[MbtaLine], departures: Departures, current_time: datetime) -> list[list[Prediction]]:
+    """Split departures up by line, preferring realtime predictions over schedules.
+
+    Returns each line's predictions in order of departure, indexed like `lines`.
+    """
+    results: list[list[Prediction]] = [[] for _ in lines]
 
     # Pull from realtime predictions first
     realtime_trips = set()
 
-    for prediction in predictions:
-        if len(results) >= 6:
-            break
-
-        trip_id = prediction["relationships"]["trip"]["data"]["id"]
+    for prediction in departures.predictions:
+        i = match_line(prediction, lines, departures.parent_stations)
+        if i is None or len(results[i]) >= MAX_PREDICTIONS:
+            continue
 
         departure_time = prediction["attributes"]["departure_time"]
         if departure_time is None:
             continue
 
-        realtime_trips.add(trip_id)
-        departure_time = datetime.strptime(departure_time, "%Y-%m-%dT%H:%M:%S%z")
+        realtime_trips.add(prediction["relationships"]["trip"]["data"]["id"])
+        departure_time = parse_time(departure_time)
+        if not is_upcoming(departure_time, current_time):
+            continue
 
-        departure_time = departure_time.replace(tzinfo=None)
-        wait_time = departure_time - current_time
+        results[i].append(Prediction(departure_time=departure_time, type="prediction", fill=lines[i].color))
 
-        if wait_time <= timedelta(minutes=0):
+    # Then, pull from schedules
+    for schedule in departures.schedules:
+        i = schedule.line
+        if len(results[i]) >= MAX_PREDICTIONS or schedule.trip_id in realtime_trips:
             continue
-        if wait_time >= timedelta(minutes=100):
+
+        if not is_upcoming(schedule.departure_time, current_time):
             continue
 
-        results.append(Prediction(line=line, eta=wait_time, type="prediction"))
+        results[i].append(Prediction(departure_time=schedule.departure_time, type="schedule", fill=SCHEDULED_COLOR))
+
+    for line_results in results:
+        line_results.sort(key=lambda x: x.departure_time)
+    return results
 
-    if len(results) >= 6:
-        return results
 
+async def get_schedules(engine: FetchEngine, lines: list[MbtaLine], api_key: str) -> dict:
+    """Fetch the next two hours of scheduled departures, for lines missing from the GTFS index."""
     # Handle mapping the current date/time to the service date/time
     # The current date/time and service date/time are the same UNLESS
     # it is between midnight and 3 AM, in which case the date is _yesterday_
@@ -93,73 +192,162 @@ def get_predictions(session: requests.Session, line: MbtaLine, api_key: str) ->
         service_hour = wall_time.hour
         service_minute = wall_time.minute
 
-    schedule_response = session.get(
-        "https://api-v3.mbta.com/schedules",
+    return await engine.get_json(
+        f"{API_URL}/schedules",
         params={
-            "filter[stop]": line.stop_id,
-            "filter[route]": line.route_id,
-            "filter[direction_id]": str(line.direction_id),
+            "filter[stop]": unique_ids([line.stop_id for line in lines]),
+            "filter[route]": unique_ids([line.route_id for line in lines]),
             "include": "stop",
             "sort": "arrival_time",
-            "page[limit]": "10",
             "filter[date]": service_date.strftime("%Y-%m-%d"),
             "filter[min_time]": f"{service_hour:02}:{service_minute:02}",
             "filter[max_time]": f"{service_hour + 2:02}:{service_minute:02}",
+            "fields[schedule]": "departure_time,direction_id",
+            "fields[stop]": "name",
             "api_key": api_key,
         },
-        timeout=15,
     )
 
-    schedule_response.raise_for_status()
-
-    schedules = schedule_response.json()["data"]
 
-    # Then, pull from schedules
-    for schedule in schedules:
-        if len(results) >= 6:
-            break
+def log_offline(resource: str, error: Exception) -> None:
+    # HostUnavailable was already logged once when the host went down
+    level = logging.DEBUG if isinstance(error, HostUnavailable) else logging.WARNING
+    logger.log(level, "Couldn't fetch %s, continuing without them: %s", resource, error)
 
-        trip_id = schedule["relationships"]["trip"]["data"]["id"]
-        if trip_id in realtime_trips:
-            continue
 
-        departure_time = schedule["attributes"]["departure_time"]
-        if departure_time is None:
-            continue
-        departure_time = datetime.strptime(departure_time, "%Y-%m-%dT%H:%M:%S%z")
+async def get_departures(
+    engine: FetchEngine,
+    lines: list[MbtaLine],
+    api_key: str,
+    realtime: tuple[list[dict], dict[str, str | None]] | None = None,
+) -> Departures:
+    """Fetch upcoming departures for every line, with one request for predictions and at most one for schedules.
 
-        departure_time = departure_time.replace(tzinfo=None)
-        wait_time = departure_time - current_time
+    Schedules come from the offline GTFS index where possible, see matrix.gtfs. Those are still returned
+    when predictions can't be fetched, e.g. without a network connection.
 
-        if wait_time <= timedelta(minutes=0):
-            continue
-        if wait_time >= timedelta(minutes=100):
-            continue
+    Predictions that are already known, e.g. from a PredictionTable, can be passed in as `realtime`.
+    """
+    if realtime is None:
+        try:
+            response = await engine.get_json(f"{API_URL}/predictions", params=prediction_params(lines, api_key))
+            realtime = response["data"], get_parent_stations(response)
+        except CONNECTION_ERRORS as e:
+            # Offline, lines covered by the GTFS index can still show their schedules
+            log_offline("predictions", e)
+            realtime = [], {}
 
-        results.append(Prediction(line=line, eta=wait_time, type="schedule"))
-
-    return results
+    predictions, parent_stations = realtime
+    departures = Departures(predictions, [], dict(parent_stations))
 
+    # Fill in lines without enough predictions from schedules
+    current_time = datetime.now()
+    results = build_predictions(lines, departures, current_time)
+    scheduled_lines = [i for i, line_results in enumerate(results) if len(line_results) < MAX_PREDICTIONS]
+
+    index = get_gtfs_index()
+    remote_lines = []
+    for i in scheduled_lines:
+        if index is None or not index.has_line(lines[i], current_time.date()):
+            remote_lines.append(i)
+            continue
+        departures.schedules.extend(
+            ScheduledDeparture(i, trip_id, departure_time)
+            for departure_time, trip_id in index.departures(lines[i], current_time, current_time + SCHEDULE_WINDOW)
+        )
+
+    if remote_lines:
+        response = await get_schedules(engine, [lines[i] for i in remote_lines], api_key)
+        parent_stations = get_parent_stations(response)
+        departures.parent_stations.update(parent_stations)
+        for schedule in response["data"]:
+            i = match_line(schedule, lines, parent_stations)
+            departure_time = schedule["attributes"]["departure_time"]
+            if i not in remote_lines or departure_time is None:
+                continue
+            departures.schedules.append(
+                ScheduledDeparture(i, schedule["relationships"]["trip"]["data"]["id"], parse_time(departure_time))
+            )
 
-def get_alert(session: requests.Session, line: MbtaLine, api_key: str) -> str | None:
-    response = session.get(
-        "https://api-v3.mbta.com/alerts",
-        params={
-            "filter[route]": line.route_id,
-            "filter[datetime]": "NOW",
-            "api_key": api_key,
-        },
-        timeout=15,
-    )
+    departures.schedules.sort(key=lambda schedule: schedule.departure_time)
+
+    return departures
+
+
+class PredictionTable:
+    """Predictions kept up to date from the V3 streaming API, keyed by id."""
+
+    def __init__(self) -> None:
+        self.predictions: dict[str, dict] = {}
+        self.parent_stations: dict[str, str | None] = {}
+        # Whether the stream has sent its initial reset event yet
+        self.is_ready = False
+        self.lock = threading.Lock()
+
+    def apply(self, event: str, data: str) -> None:
+        """Apply a reset, add, update or remove event from the stream."""
+        payload = json.loads(data)
+        with self.lock:
+            if event == "reset":
+                self.predictions.clear()
+                for resource in payload:
+                    self.add(resource)
+                self.is_ready = True
+            elif event in ("add", "update"):
+                self.add(payload)
+            elif event == "remove":
+                self.predictions.pop(payload["id"], None)
+
+    def mark_stale(self) -> None:
+        """Stop using the table once the stream disconnects, until it reconnects and sends a new reset."""
+        with self.lock:
+            self.is_ready = False
+
+    def add(self, resource: dict) -> None:
+        if resource["type"] == "prediction":
+            self.predictions[resource["id"]] = resource
+        elif resource["type"] == "stop":
+            self.parent_stations[resource["id"]] = get_parent_station(resource)
+
+    def snapshot(self) -> tuple[list[dict], dict[str, str | None]]:
+        """Return the current predictions, sorted by departure time, and the parent stations of their stops."""
+        with self.lock:
+            predictions = sorted(
+                self.predictions.values(),
+                key=lambda prediction: prediction["attributes"]["departure_time"] or "",
+            )
+            return predictions, dict(self.parent_stations)
+
+
+async def get_alert(engine: FetchEngine, lines: list[MbtaLine], api_key: str) -> tuple[str, MbtaLine] | None:
+    """Fetch the current alert for the first of the given lines that has one, in a single request.
+
+    Returns None if there isn't one, or if it can't be fetched, so that departures can still be shown.
+    """
+    try:
+        response = await engine.get_json(
+            f"{API_URL}/alerts",
+            params={
+                "filter[route]": unique_ids([line.route_id for line in lines]),
+                "filter[datetime]": "NOW",
+                "fields[alert]": "short_header,informed_entity",
+                "api_key": api_key,
+            },
+        )
+    except CONNECTION_ERRORS as e:
+        log_offline("alerts", e)
+        return None
 
-    response.raise_for_status()
-    data = response.json()["data"]
+    for line in lines:
+        for alert in response["data"]:
+            routes = {entity.get("route") for entity in alert["attributes"]["informed_entity"]}
+            if line.route_id in routes:
+                return shorten_alert(alert["attributes"]["short_header"]), line
 
-    if len(data) == 0:
-        return None
+    return None
 
-    mbta_text = data[0]["attributes"]["short_header"]
 
+def shorten_alert(mbta_text: str) -> str:
     # Bus alerts of the form
     # Route 109 is experiencing delays of up to 20 minutes due to traffic
     # can be condensed
@@ -197,7 +385,12 @@ def get_alert(session: requests.Session, line: MbtaLine, api_key: str) -> str |
     return mbta_text
 
 
-MbtaData: TypeAlias = tuple[list[Prediction], str | None, MbtaLine | None]
+# Predictions of each configured line, alert, and the line the alert is for
+MbtaData: TypeAlias = tuple[list[list[Prediction]], str | None, MbtaLine | None]
+
+
+def has_upcoming(line_predictions: list[list[Prediction]], now: datetime) -> bool:
+    return any(prediction.departure_time > now for predictions in line_predictions for prediction in predictions)
 
 
 def darken_hex(color: str):
@@ -206,189 +399,241 @@ def darken_hex(color: str):
     return f"#{int(r * x):02x}{int(g * x):02x}{int(b * x):02x}"
 
 
+@dataclass
+class LineHeader:
+    """A line's badge and headsign, drawn once for pasting onto every frame."""
+
+    image: Image.Image
+    # Where to paste the image, for the first row
+    offset: tuple[int, int]
+    # Where the line's countdowns start
+    countdown_x: int
+
+
+def render_line_header(line: MbtaLine, size: PanelSize) -> LineHeader:
+    # Transparent rather than black, so pasting it is the same as drawing it
+    image = Image.new("RGBA", size.value, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    transparent = (0, 0, 0, 0)
+
+    if size == PanelSize.PANEL_64x64:
+        length = text_length(line.symbol, font=smallfont)
+        top, bottom = 9, 17
+        draw.rectangle((1, top, 1 + length + 2, bottom), outline=darken_hex(line.color))
+        draw_text(draw, (3, 11), line.symbol, font=smallfont, fill=line.color)
+        draw_text(draw, (6 + length, 10), line.headsign, font=font, fill=line.color)
+        countdown_x = 2
+    else:
+        length = text_length(line.symbol, font=font)
+        top, bottom = 1, 10
+        draw.rectangle((1, top, 1 + length + 2, bottom), outline=darken_hex(line.color))
+        draw_text(draw, (3, 3), line.symbol, font=font, fill=line.color)
+        draw_text(draw, (6 + length, 1), line.headsign, font=smallfont, fill=line.color)
+        countdown_x = int(1 + length + 2 + 3)
+
+    # Round off the badge's corners
+    for corner in ((1, top), (1, bottom), (1 + length + 2, top), (1 + length + 2, bottom)):
+        draw.point(corner, fill=transparent)
+
+    bbox = image.getbbox() or (0, 0, 1, 1)
+    return LineHeader(image.crop(bbox), (bbox[0], bbox[1]), countdown_x)
+
+
 class MBTA(Screen[MbtaData]):
-    CACHE_TTL = 30
+    # Countdowns are worked out from departure times on every frame, so they stay accurate between fetches
+    CACHE_TTL = 90
+    DATA_VERSION = 3
 
     def __init__(self):
-        self.scroll_idx = 0
+        self.alert_ticker = Ticker(63, font, "#ff0000")
         config = get_config().screens.mbta
         self.api_key = config.api_key
         self.lines = config.lines
 
+        # Live predictions, when streaming is enabled
+        self.table: PredictionTable | None = None
+        self.stream: EventStream | None = None
+        # Departures from the latest fetch, which streamed predictions are merged into
+        self.departures: Departures | None = None
+
         super().__init__()
 
-    def fetch_data(self):
+        self.headers = [render_line_header(line, self.size) for line in self.lines]
+        self.min_width = font.getlength("min")
+
+        if config.streaming and self.api_key:
+            self.table = PredictionTable()
+            self.stream = EventStream(
+                f"{API_URL}/predictions",
+                self.on_stream_event,
+                params=prediction_params(self.lines, self.api_key),
+                # Predictions are polled again while the stream is down
+                on_disconnect=self.table.mark_stale,
+            )
+
+    def start(self) -> None:
+        super().start()
+        if self.stream is not None:
+            self.stream.start()
+
+    def cancel(self) -> None:
+        super().cancel()
+        if self.stream is not None:
+            self.stream.cancel()
+
+    def get_predictions(self, departures: Departures) -> list[list[Prediction]]:
+        return build_predictions(self.lines, departures, datetime.now())
+
+    async def fetch_data(self):
         api_key = self.api_key
         if not api_key:
             return self.fallback_data()
 
-        with ThreadPoolExecutor() as tpe:
-            predictions = [
-                prediction
-                for line_predictions in tpe.map(
-                    lambda line: get_predictions(self.session, line, api_key),
-                    self.lines,
-                )
-                for prediction in line_predictions
-            ]
-        predictions.sort(key=lambda x: x.eta)
-
-        alert = None
-        alert_line = None
-        for line in self.lines[:2]:
-            alert = get_alert(self.session, line, api_key)
-            if alert is not None:
-                alert_line = line
-                break
-
-        return (predictions, alert, alert_line)
+        realtime = self.table.snapshot() if self.table is not None and self.table.is_ready else None
+        departures, line_alert = await asyncio.gather(
+            get_departures(self.engine, self.lines, api_key, realtime),
+            get_alert(self.engine, self.lines[:2], api_key),
+        )
+        self.departures = departures
+        if self.table is not None and self.table.is_ready:
+            # Include predictions streamed in while fetching, which were merged into the data being replaced
+            departures = self.with_streamed_predictions(departures)
+
+        alert, alert_line = line_alert or (None, None)
+        return (self.get_predictions(departures), alert, alert_line)
+
+    def with_streamed_predictions(self, departures: Departures) -> Departures:
+        assert self.table is not None
+        predictions, parent_stations = self.table.snapshot()
+        return Departures(predictions, departures.schedules, departures.parent_stations | parent_stations)
+
+    def on_stream_event(self, event: str, data: str) -> None:
+        """Update the predictions from the stream, between fetches of schedules and alerts."""
+        assert self.table is not None
+        self.table.apply(event, data)
+        # Merged on the fetch engine's loop, so that only one thread ever writes cached_data
+        self.engine.loop.call_soon_threadsafe(self.merge_stream_predictions)
+
+    def merge_stream_predictions(self) -> None:
+        assert self.table is not None
+        if self.departures is None or not self.has_data.is_set() or not self.table.is_ready:
+            return
+        if self.fetch_failed and (self.data_age is None or self.data_age > MAX_DATA_AGE):
+            # Showing fallback data, until a refresh succeeds
+            return
+
+        _predictions, alert, alert_line = self.cached_data
+        self.cached_data = (self.get_predictions(self.with_streamed_predictions(self.departures)), alert, alert_line)
+        if self.is_visible:
+            request_redraw()
 
     def fallback_data(self):
         return ([], None, None)
 
+    def draw_countdowns(
+        self,
+        draw: ImageDraw.ImageDraw,
+        predictions: list[Prediction],
+        pixel_x: int,
+        y: int,
+        now: datetime,
+    ) -> None:
+        """Draw the minutes until each departure that fits on a row, followed by "min"."""
+        X_MARGIN = 3
+        max_x = 64 - (self.min_width + X_MARGIN)
+
+        for prediction in predictions:
+            # Skip trains that have left since the predictions were fetched
+            if prediction.departure_time <= now:
+                continue
+
+            time_str = str(prediction.minutes_until(now))
+            length = int(text_length(time_str, font=font))
+            if pixel_x + length > max_x:
+                break
+
+            draw_text(draw, (pixel_x, y), time_str, font=font, fill=prediction.fill)
+            pixel_x += length + X_MARGIN
+
+        draw_text(draw, (pixel_x, y), "min", font=font, fill=SCHEDULED_COLOR)
+
     def get_image_64x64(self):
         image = Image.new("RGB", (64, 64))
         draw = ImageDraw.Draw(image)
-        predictions, alert, alert_line = self.data
-        time_str = datetime.now().strftime("%H:%M")
-        draw.text((1, 1), "Transit", font=font, fill="#FFAA00")
-        draw.text((39, 1), f"{time_str:>5}", font=font, fill="#FFAA00")
+        now = datetime.now()
+        line_predictions, alert, alert_line = self.data
+        time_str = now.strftime("%H:%M")
+        draw_text(draw, (1, 1), "Transit", font=font, fill="#FFAA00")
+        draw_text(draw, (39, 1), f"{time_str:>5}", font=font, fill="#FFAA00")
 
-        if len(predictions) == 0:
-            image.paste(Image.open("icons/train_sleeping.png"), (16, 11))
+        if not has_upcoming(line_predictions, now):
+            load_icon("train_sleeping").paste(image, (16, 11))
 
-            draw.text((7, 45), "trains are", font=font, fill="#FFAA00")
-            draw.text((7, 54), " sleeping", font=font, fill="#FFAA00")
+            draw_text(draw, (7, 45), "trains are", font=font, fill="#FFAA00")
+            draw_text(draw, (7, 54), " sleeping", font=font, fill="#FFAA00")
 
             return image
 
-        X_MARGIN = 3
-
         lines_displayed = 2 if alert else 3
 
-        for row, line in enumerate(self.lines[:lines_displayed]):
-            length = draw.textlength(line.symbol, font=smallfont)
-
-            draw.rectangle(
-                (1, 9 + 19 * row, 1 + length + 2, 17 + 19 * row),
-                outline=darken_hex(line.color),
-            )
-            draw.point((1, 9 + 19 * row), fill="#000000")
-            draw.point((1, 17 + 19 * row), fill="#000000")
-            draw.point((1 + length + 2, 9 + 19 * row), fill="#000000")
-            draw.point((1 + length + 2, 17 + 19 * row), fill="#000000")
-
-            draw.text((3, 11 + 19 * row), line.symbol, font=smallfont, fill=line.color)
-
-            draw.text((6 + length, 10 + 19 * row), line.headsign, font=font, fill=line.color)
-            line_predictions = filter(lambda p: p.line == line, predictions)
-
-            pixel_x = 2
-            for prediction in line_predictions:
-                time_str = str(int(prediction.eta / timedelta(minutes=1)))
-                length = int(draw.textlength(time_str, font=font))
-                if pixel_x + length > 64 - (draw.textlength("min", font=font) + X_MARGIN):
-                    break
-
-                draw.text(
-                    (pixel_x, 19 + 19 * row),
-                    time_str,
-                    font=font,
-                    fill=line.color if prediction.type == "prediction" else "#888888",
-                )
-
-                pixel_x += length + X_MARGIN
-
-            draw.text(
-                (pixel_x, 19 + 19 * row),
-                "min",
-                font=font,
-                fill="#888888",
-            )
+        for row, (header, predictions) in enumerate(zip(self.headers[:lines_displayed], line_predictions)):
+            x, y = header.offset
+            image.paste(header.image, (x, y + 19 * row), header.image)
+            self.draw_countdowns(draw, predictions, header.countdown_x, 19 + 19 * row, now)
 
         if alert and alert_line:
-            alert_text = alert + "  "
-            textlength = int(draw.textlength(alert_text, font=font))
-
-            image.paste(Image.open("icons/alert.png"), (1, 46))
+            load_icon("alert").paste(image, (1, 46))
 
             draw.line((9, 47, 60, 47), fill="#888888")
 
-            draw.text((12, 50), f"{alert_line.label} Alert", font=smallfont, fill="#888888")
+            draw_text(draw, (12, 50), f"{alert_line.label} Alert", font=smallfont, fill="#888888")
 
-            draw.text((1 - self.scroll_idx, 57), alert_text, font=font, fill="#ff0000")
-            draw.text(
-                (1 - self.scroll_idx + textlength, 57),
-                alert_text,
-                font=font,
-                fill="#ff0000",
-            )
-            self.scroll_idx += 1
-            self.scroll_idx %= textlength
+            self.alert_ticker.set_text(alert)
+            self.alert_ticker.draw(image, (1, 57))
 
         return image
 
     def get_image_64x32(self):
         image = Image.new("RGB", (64, 32))
         draw = ImageDraw.Draw(image)
-        predictions, _alert, _alert_line = self.data
+        now = datetime.now()
+        line_predictions, _alert, _alert_line = self.data
 
-        if len(predictions) == 0:
-            image.paste(Image.open("icons/train_sleeping.png"), (16, 0))
+        if not has_upcoming(line_predictions, now):
+            load_icon("train_sleeping").paste(image, (16, 0))
 
             return image
 
-        X_MARGIN = 3
-
         lines_displayed = 2
 
-        for row, line in enumerate(self.lines[:lines_displayed]):
-            length = draw.textlength(line.symbol, font=font)
-
-            draw.rectangle(
-                (1, 1 + 16 * row, 1 + length + 2, 10 + 16 * row),
-                outline=darken_hex(line.color),
-            )
-            draw.point((1, 1 + 16 * row), fill="#000000")
-            draw.point((1, 10 + 16 * row), fill="#000000")
-            draw.point((1 + length + 2, 1 + 16 * row), fill="#000000")
-            draw.point((1 + length + 2, 10 + 16 * row), fill="#000000")
-
-            draw.text((3, 3 + 16 * row), line.symbol, font=font, fill=line.color)
-
-            draw.text(
-                (6 + length, 1 + 16 * row),
-                line.headsign,
-                font=smallfont,
-                fill=line.color,
-            )
-            line_predictions = filter(lambda p: p.line == line, predictions)
-
-            pixel_x = 1 + length + 2 + 3
-            for prediction in line_predictions:
-                time_str = str(int(prediction.eta / timedelta(minutes=1)))
-                length = draw.textlength(time_str, font=font)
-                if pixel_x + length > 64 - (draw.textlength("min", font=font) + X_MARGIN):
-                    break
-
-                draw.text(
-                    (pixel_x, 8 + 16 * row),
-                    time_str,
-                    font=font,
-                    fill=line.color if prediction.type == "prediction" else "#888888",
-                )
-
-                pixel_x += length + X_MARGIN
-
-            draw.text(
-                (pixel_x, 8 + 16 * row),
-                "min",
-                font=font,
-                fill="#888888",
-            )
+        for row, (header, predictions) in enumerate(zip(self.headers[:lines_displayed], line_predictions)):
+            x, y = header.offset
+            image.paste(header.image, (x, y + 16 * row), header.image)
+            self.draw_countdowns(draw, predictions, header.countdown_x, 8 + 16 * row, now)
 
         return image
 
+    def next_update(self) -> float | None:
+        line_predictions, alert, alert_line = self.data
+        now = datetime.now()
+        if not has_upcoming(line_predictions, now):
+            return next_minute()
+
+        deadlines = [next_minute()]
+        # The alert scrolls if it's too long to fit
+        ticker_deadline = self.alert_ticker.next_update()
+        if self.size == PanelSize.PANEL_64x64 and alert and alert_line and ticker_deadline is not None:
+            deadlines.append(ticker_deadline)
+
+        # Countdowns tick over at a whole number of minutes before each departure, not on the minute
+        deadlines.extend(
+            time.time() + (prediction.departure_time - now).total_seconds() % 60
+            for predictions in line_predictions
+            for prediction in predictions
+            if prediction.departure_time > now
+        )
+        return min(deadlines)
+
     def get_time_stretch(self):
         if self.data and self.data[1]:
             # remain on screen for 5s for alerts
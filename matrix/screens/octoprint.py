@@ -1,3 +1,4 @@
+import asyncio
 import math
 from urllib.parse import urljoin
 
@@ -5,29 +6,42 @@ from PIL import Image, ImageDraw
 
 from matrix.resources.fonts import font, smallfont
 from matrix.screens.screen import Screen
-from matrix.utils.config import get_config
+from matrix.utils.config import PanelSize, get_config
+from matrix.utils.schedule import next_minute
+from matrix.utils.text import draw_text
+from matrix.utils.ticker import Ticker
+
+# Lines of the filename that fit above the progress bar on 64x64 panels
+FILENAME_LINES = 4
 
 
 class Octoprint(Screen[dict]):
     CACHE_TTL = 5
+    # Only shown while a print is running, which we have to keep checking for
+    REFRESH_WHEN_HIDDEN = True
 
     def __init__(self):
         config = get_config().screens.octoprint
+        assert config is not None  # Required by ScreensConfig when the screen is in the rotation
         self.api_key = config.api_key
         self.endpoint = config.endpoint
         self.printer_name = config.printer_name
 
         super().__init__()
 
-    def _get(self, path: str):
-        return self.session.get(
+        # Filenames too long for the space they have scroll instead
+        self.filename_ticker = Ticker(59 if self.size == PanelSize.PANEL_64x64 else 62, smallfont, "#AAAAAA")
+        self.is_filename_scrolling = False
+
+    async def _get(self, path: str):
+        return await self.engine.get_json(
             urljoin(self.endpoint, path),
             headers={"Authorization": f"Bearer {self.api_key}"},
-        ).json()
+        )
 
-    def fetch_data(self):
-        is_connected = self._get("/api/connection")["current"]["state"] != "Offline"
-        current_job = self._get("/api/job")
+    async def fetch_data(self):
+        connection, current_job = await asyncio.gather(self._get("/api/connection"), self._get("/api/job"))
+        is_connected = connection["current"]["state"] != "Offline"
 
         # {
         # "job": {
@@ -65,6 +79,11 @@ class Octoprint(Screen[dict]):
             "current_job": None,
         }
 
+    def next_update(self) -> float | None:
+        if self.is_filename_scrolling and (ticker_deadline := self.filename_ticker.next_update()) is not None:
+            return min(next_minute(), ticker_deadline)
+        return next_minute()
+
     @property
     def is_active(self):
         return (
@@ -78,19 +97,27 @@ class Octoprint(Screen[dict]):
         image = Image.new("RGB", (64, 64))
         draw = ImageDraw.Draw(image)
 
-        draw.text(
+        draw_text(
+            draw,
             (32 - (len(self.printer_name) * 5) // 2, 1),
-            text=self.printer_name,
+            self.printer_name,
             font=font,
             fill="#77ff00",
         )
 
-        # wrap to 15 ch
+        # wrap to 15 ch, scrolling whatever doesn't fit on the last line
         filename = self.data["current_job"]["job"]["file"]["name"]
-        for i in range(math.ceil(len(filename) / 15)):
-            draw.text(
-                (1 + (2 if i > 0 else 0), 10 + 7 * i),
-                text=filename[15 * i : 15 * (i + 1)],
+        self.is_filename_scrolling = len(filename) > 15 * FILENAME_LINES
+        for i in range(min(math.ceil(len(filename) / 15), FILENAME_LINES)):
+            x, y = 1 + (2 if i > 0 else 0), 10 + 7 * i
+            if i == FILENAME_LINES - 1 and self.is_filename_scrolling:
+                self.filename_ticker.set_text(filename[15 * i :])
+                self.filename_ticker.draw(image, (x, y))
+                break
+            draw_text(
+                draw,
+                (x, y),
+                filename[15 * i : 15 * (i + 1)],
                 font=smallfont,
                 fill="#AAAAAA",
             )
@@ -98,20 +125,22 @@ class Octoprint(Screen[dict]):
         elapsed = self.data["current_job"]["progress"]["printTime"]
         remaining = self.data["current_job"]["progress"]["printTimeLeft"]
 
-        draw.text(
+        draw_text(
+            draw,
             (1, 56),
-            text=f"{elapsed // 3600:>2}:{(elapsed % 3600) // 60:02}",
+            f"{elapsed // 3600:>2}:{(elapsed % 3600) // 60:02}",
             font=font,
             fill="#FFFFFF",
         )
-        draw.text((26, 57), text="e", font=smallfont, fill="#AAAAAA")
-        draw.text(
+        draw_text(draw, (26, 57), "e", font=smallfont, fill="#AAAAAA")
+        draw_text(
+            draw,
             (32, 56),
-            text=f"{remaining // 3600:>2}:{(remaining % 3600) // 60:02}",
+            f"{remaining // 3600:>2}:{(remaining % 3600) // 60:02}",
             font=font,
             fill="#FFFFFF",
         )
-        draw.text((57, 57), text="r", font=smallfont, fill="#AAAAAA")
+        draw_text(draw, (57, 57), "r", font=smallfont, fill="#AAAAAA")
 
         completion = self.data["current_job"]["progress"]["completion"]
 
@@ -126,7 +155,7 @@ class Octoprint(Screen[dict]):
         )
         draw.rectangle((1, 40, 62, 49), outline="#AAAAAA")
 
-        draw.text((24, 42), text=f"{int(completion):>2}%", font=font, fill="#FFFFFF")
+        draw_text(draw, (24, 42), f"{int(completion):>2}%", font=font, fill="#FFFFFF")
 
         return image
 
@@ -134,37 +163,37 @@ class Octoprint(Screen[dict]):
         image = Image.new("RGB", (64, 32))
         draw = ImageDraw.Draw(image)
 
-        draw.text(
+        draw_text(
+            draw,
             (32 - (len(self.printer_name) * 5) // 2, 1),
-            text=self.printer_name,
+            self.printer_name,
             font=font,
             fill="#77ff00",
         )
 
-        draw.text(
-            (1, 10),
-            text=self.data["current_job"]["job"]["file"]["name"],
-            font=smallfont,
-            fill="#AAAAAA",
-        )
+        self.filename_ticker.set_text(self.data["current_job"]["job"]["file"]["name"])
+        self.filename_ticker.draw(image, (1, 10))
+        self.is_filename_scrolling = self.filename_ticker.is_scrolling
 
         elapsed = self.data["current_job"]["progress"]["printTime"]
         remaining = self.data["current_job"]["progress"]["printTimeLeft"]
 
-        draw.text(
+        draw_text(
+            draw,
             (1, 19),
-            text=f"{elapsed // 3600:>2}:{(elapsed % 3600) // 60:02}",
+            f"{elapsed // 3600:>2}:{(elapsed % 3600) // 60:02}",
             font=font,
             fill="#FFFFFF",
         )
-        draw.text((26, 20), text="e", font=smallfont, fill="#AAAAAA")
-        draw.text(
+        draw_text(draw, (26, 20), "e", font=smallfont, fill="#AAAAAA")
+        draw_text(
+            draw,
             (32, 19),
-            text=f"{remaining // 3600:>2}:{(remaining % 3600) // 60:02}",
+            f"{remaining // 3600:>2}:{(remaining % 3600) // 60:02}",
             font=font,
             fill="#FFFFFF",
         )
-        draw.text((57, 20), text="r", font=smallfont, fill="#AAAAAA")
+        draw_text(draw, (57, 20), "r", font=smallfont, fill="#AAAAAA")
 
         draw.rectangle(
             (
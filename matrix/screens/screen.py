@@ -1,43 +1,110 @@
+import enum
 import logging
 import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
 
 import requests
 from datadog.dogstatsd.base import statsd
-from requests.adapters import HTTPAdapter, Retry
-
-from matrix.utils.config import get_panel_size
+from PIL import Image, ImageDraw
+
+from matrix.resources.fonts import font, smallfont
+from matrix.utils.config import get_config, get_panel_size
+from matrix.utils.connectivity import CONNECTION_ERRORS, HostUnavailable
+from matrix.utils.data_store import MAX_DATA_AGE, get_data_store
+from matrix.utils.fetch_engine import get_fetch_engine
+from matrix.utils.fetch_scheduler import get_fetch_scheduler
+from matrix.utils.metrics import metrics
 from matrix.utils.panels import Drawable
+from matrix.utils.schedule import request_redraw
+from matrix.utils.text import draw_text, text_length
 
 logger = logging.getLogger(__name__)
 
-CACHE_TTL = 60
-
 T = TypeVar("T")
 
 
+class FetchState(enum.StrEnum):
+    LOADING = enum.auto()  # nothing fetched yet
+    FRESH = enum.auto()
+    STALE = enum.auto()  # restored from disk, and not fetched again yet
+    REFRESHING = enum.auto()  # being fetched again
+    FAILED = enum.auto()  # the latest fetch failed
+
+
+@dataclass(frozen=True)
+class DataSnapshot(Generic[T]):
+    data: T
+    # Seconds since the data was fetched, or None for fallback data
+    age: float | None
+    state: FetchState
+
+
 class Screen(ABC, Drawable, Generic[T]):
+    # How often to refresh this screen's data, in seconds
+    CACHE_TTL: float = 60
+    # Whether to keep refreshing while the screen isn't shown, for screens whose
+    # data decides whether they are shown at all
+    REFRESH_WHEN_HIDDEN: bool = False
+    # Bump this when the type of the screen's data changes, so that data saved in the old format isn't restored
+    DATA_VERSION: int = 1
+
     def __init__(self) -> None:
         self.size = get_panel_size()
         self.cached_data: T
+        self.engine = get_fetch_engine()
 
-        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
+        self.has_data = threading.Event()
+        # When the current data was fetched, and whether it was restored from disk after a restart
+        self.fetched_at: float | None = None
+        self.is_restored = False
+        self.fetch_failed = False
+        self.is_refreshing = False
+        self.is_cancelled = False
 
-        self.session = requests.Session()
-        self.session.mount("https://", HTTPAdapter(max_retries=retries))
+        self.is_enabled = True
+        self.is_visible = False
+        self.next_shown: float | None = None
+        self.prefetch_lead = get_config().screens.prefetch_lead
 
-        self.has_data = threading.Event()
-        self.cancel_timer = threading.Event()
+    def start(self) -> None:
+        """Start fetching data in the background, every CACHE_TTL seconds.
 
-        self.thread = threading.Thread(target=self.background_fetcher, daemon=True)
-        self.thread.start()
+        Until the first fetch finishes, the data saved before the last restart is used if there is any.
+        """
+        if (saved := get_data_store().load(self.__class__.__name__, self.DATA_VERSION)) is not None:
+            self.fetched_at, self.cached_data = saved
+            self.is_restored = True
+            self.has_data.set()
 
-        self.is_enabled = True
+        get_fetch_scheduler().add(self)
 
     def cancel(self) -> None:
-        self.cancel_timer.set()
+        self.is_cancelled = True
+
+    def set_visible(self, is_visible: bool) -> None:
+        """Mark whether this screen is on the display, refreshing its data if it was put on hold."""
+        self.is_visible = is_visible
+        if is_visible:
+            self.next_shown = None
+            get_fetch_scheduler().wake(self)
+
+    def prefetch(self, show_time: float) -> None:
+        """Make sure data is refreshed shortly before this screen is shown at the given time."""
+        self.next_shown = show_time
+        get_fetch_scheduler().wake(self, delay=max(show_time - self.prefetch_lead - time.time(), 0))
+
+    def should_refresh(self) -> bool:
+        """Return if the screen's data is worth refreshing right now."""
+        if not self.has_data.is_set() or self.is_restored:
+            return True
+        if not self.is_enabled:
+            return False
+        if self.REFRESH_WHEN_HIDDEN or self.is_visible:
+            return True
+        return self.next_shown is not None and time.time() >= self.next_shown - self.prefetch_lead
 
     def __del__(self) -> None:
         self.cancel()
@@ -47,43 +114,134 @@ class Screen(ABC, Drawable, Generic[T]):
         """Return if the screen should be displayed"""
         return self.is_enabled
 
-    def fetch_url(self, url: str) -> requests.Response:
-        return self.session.get(url, timeout=15)
-
-    def background_fetcher(self) -> None:
-        while True:
-            try:
-                t0 = time.time()
-                self.cached_data = self.fetch_data()
-                statsd.gauge(
-                    "matrix.load_seconds",
-                    time.time() - t0,
-                    tags=[f"image:{self.__class__.__name__}"],
-                )
-            except Exception as e:
+    async def fetch_url(self, url: str) -> requests.Response:
+        return await self.engine.get(url)
+
+    async def fetch_json(self, url: str, keep_decoded: bool = True) -> Any:
+        """Fetch a URL and parse it as JSON, skipping the parse if the response hasn't changed."""
+        return await self.engine.get_json(url, keep_decoded)
+
+    async def refresh(self) -> None:
+        """Fetch the latest data and redraw. Called by the fetch scheduler."""
+        self.is_refreshing = True
+        try:
+            t0 = time.time()
+            self.cached_data = await self.fetch_data()
+            self.fetched_at = time.time()
+            self.is_restored = False
+            self.fetch_failed = False
+            await self.engine.run(
+                get_data_store().save, self.__class__.__name__, self.fetched_at, self.cached_data, self.DATA_VERSION
+            )
+            load_seconds = self.fetched_at - t0
+            statsd.gauge(
+                "matrix.load_seconds",
+                load_seconds,
+                tags=[f"image:{self.__class__.__name__}"],
+            )
+            metrics.record("fetch", load_seconds, screen=self.__class__.__name__)
+        except Exception as e:
+            if isinstance(e, HostUnavailable):
+                # Already logged once when the host went down
+                logger.debug("Skipped fetching data for %s: %s", self.__class__.__name__, e)
+            elif isinstance(e, CONNECTION_ERRORS):
+                logger.warning("Couldn't fetch data for %s: %s", self.__class__.__name__, e)
+            else:
                 logger.exception("Error while fetching data: %s", e)
+            self.fetch_failed = True
+            # Keep showing the last good data for as long as it's useful
+            if self.data_age is None or self.data_age > MAX_DATA_AGE:
                 self.cached_data = self.fallback_data()
-            finally:
-                self.has_data.set()
-
-            if self.cancel_timer.wait(timeout=CACHE_TTL):
-                return
+        finally:
+            self.is_refreshing = False
+            self.has_data.set()
+            request_redraw()
 
     @abstractmethod
-    def fetch_data(self) -> T:
-        """Fetch the latest data for this screen."""
+    async def fetch_data(self) -> T:
+        """Fetch the latest data for this screen.
+
+        This runs on the fetch engine's event loop, so anything that blocks
+        should go through self.engine.run() or self.engine.get().
+        """
 
     @abstractmethod
     def fallback_data(self) -> T:
         """Return fallback data if requesting data fails."""
         pass
 
+    def load_data(self, data: T) -> None:
+        """Use the given data instead of fetching it, e.g. for benchmarks."""
+        self.cached_data = data
+        self.fetched_at = time.time()
+        self.has_data.set()
+
+    @property
+    def data_age(self) -> float | None:
+        """Seconds since the current data was fetched, or None if it is fallback data."""
+        if self.fetched_at is None:
+            return None
+        return time.time() - self.fetched_at
+
+    def draw_data_age(self, image: Image.Image) -> None:
+        """Mark an image drawn from out-of-date data with how old that data is.
+
+        This happens when the data was restored from disk after a restart, or the latest fetch failed.
+        """
+        snapshot = self.snapshot
+        if snapshot.state not in (FetchState.STALE, FetchState.FAILED) or (age := snapshot.age) is None:
+            return
+        label = f"{int(age // 60)}m" if age < 60 * 60 else f"{int(age // (60 * 60))}h"
+
+        draw = ImageDraw.Draw(image)
+        width = int(text_length(label, font=smallfont))
+        x, y = image.width - width - 1, image.height - 7
+        draw.rectangle((x - 1, y, image.width - 1, image.height - 1), fill="#000000")
+        draw_text(draw, (x, y), label, font=smallfont, fill="#888888")
+
     @property
     def data(self) -> T:
-        """Return the latest cached data."""
-        self.has_data.wait()
+        """Return the latest data without waiting for a fetch, or fallback data if there is none yet."""
+        if not self.has_data.is_set():
+            return self.fallback_data()
         return self.cached_data
 
+    @property
+    def snapshot(self) -> DataSnapshot[T]:
+        """Return the latest data along with how old it is and what fetching it is up to."""
+        if not self.has_data.is_set():
+            return DataSnapshot(self.fallback_data(), None, FetchState.LOADING)
+
+        # Out-of-date data stays marked as such while it's being fetched again
+        if self.fetch_failed:
+            state = FetchState.FAILED
+        elif self.is_restored:
+            state = FetchState.STALE
+        elif self.is_refreshing:
+            state = FetchState.REFRESHING
+        else:
+            state = FetchState.FRESH
+        return DataSnapshot(self.cached_data, self.data_age, state)
+
+    def get_image(self) -> Image.Image | None:
+        if self.snapshot.state == FetchState.LOADING:
+            return self.get_image_loading()
+        return super().get_image()
+
+    def get_image_loading(self) -> Image.Image:
+        """Get the image shown until the first data arrives."""
+        image = self.size.empty_image()
+        draw = ImageDraw.Draw(image)
+
+        width, height = image.size
+        for text, y, text_font, fill in (
+            (self.__class__.__name__, height // 2 - 8, font, "#888888"),
+            ("loading...", height // 2 + 2, smallfont, "#444444"),
+        ):
+            draw_text(draw, ((width - text_length(text, font=text_font)) // 2, y), text, font=text_font, fill=fill)
+
+        return image
+
     def get_time_stretch(self) -> float | None:
         """Screens can return a duration here to increase the amount of time displayed.
 
@@ -1,22 +1,31 @@
 import io
+from typing import TYPE_CHECKING
 
-import spotipy
 from PIL import Image
-from spotipy.oauth2 import SpotifyOAuth
 
 from matrix.screens.screen import Screen
 from matrix.utils.config import get_config
 
+if TYPE_CHECKING:
+    import spotipy
+
 scope = "user-read-currently-playing user-read-playback-state"
 
 
 class Spotify(Screen[Image.Image | None]):
     CACHE_TTL = 15
+    # Only shown while something is playing, which we have to keep checking for
+    REFRESH_WHEN_HIDDEN = True
     has_login = False
-    spotify_clients: dict[str, spotipy.Spotify] = {}
+    spotify_clients: dict[str, "spotipy.Spotify"] = {}
 
-    def fetch_data(self):
+    def get_cover_url(self) -> str | None:
+        """Return the album art of whatever the first of our users is playing. Blocks on spotipy requests."""
         if not self.has_login:
+            # Imported on the first fetch rather than at startup, since it's slow to import
+            import spotipy
+            from spotipy.oauth2 import SpotifyOAuth
+
             for account in get_config().screens.spotify.users:
                 print(f"Logging in {account}...")
                 auth_manager = SpotifyOAuth(
@@ -32,9 +41,14 @@ class Spotify(Screen[Image.Image | None]):
         for sp in self.spotify_clients.values():
             state = sp.current_user_playing_track()
             if state and state["item"]:
-                cover_url = state["item"]["album"]["images"][0]["url"]
-                image_data = self.fetch_url(cover_url).content
-                return Image.open(io.BytesIO(image_data)).resize((64, 64))
+                return state["item"]["album"]["images"][0]["url"]
+
+        return None
+
+    async def fetch_data(self):
+        if cover_url := await self.engine.run(self.get_cover_url):
+            image_data = (await self.fetch_url(cover_url)).content
+            return Image.open(io.BytesIO(image_data)).resize((64, 64))
 
         return None
 
@@ -57,6 +71,9 @@ class Spotify(Screen[Image.Image | None]):
 
         return image
 
+    def next_update(self) -> float | None:
+        return None
+
     @property
     def is_active(self):
         return self.is_enabled and self.data is not None
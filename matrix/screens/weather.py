@@ -1,12 +1,14 @@
 import datetime
-from pathlib import Path
 from typing import TypedDict
 
 from PIL import Image, ImageDraw
 
 from matrix.resources.fonts import bigfont, font
+from matrix.resources.icons import load_icon
 from matrix.screens.screen import Screen
 from matrix.utils.config import get_config
+from matrix.utils.data_sources import get_open_meteo
+from matrix.utils.text import draw_text
 
 TIME_DATE_COLOR = "#aaaaaa"
 HIGH_COLOR = "#ffa024"
@@ -57,31 +59,35 @@ WMO_ICON_MAP: dict[str, tuple[list[int], list[int]]] = {
 }
 
 
+# (WMO code, is day) -> icon name, built from the above
+WMO_ICONS: dict[tuple[int, bool], str] = {}
+for icon, (day_codes, night_codes) in WMO_ICON_MAP.items():
+    for code in day_codes:
+        WMO_ICONS.setdefault((code, True), icon)
+    for code in night_codes:
+        WMO_ICONS.setdefault((code, False), icon)
+
+
 def get_icon(wmo_code: int, is_day: bool) -> str | None:
-    for icon, (day_codes, night_codes) in WMO_ICON_MAP.items():
-        codes = day_codes if is_day else night_codes
-        if wmo_code in codes:
-            return icon
-    return None
+    return WMO_ICONS.get((wmo_code, is_day))
 
 
 class Weather(Screen[WeatherData | None]):
     CACHE_TTL = 600
 
-    def fetch_data(self):
+    def __init__(self) -> None:
+        super().__init__()
         config = get_config().screens.weather
-        url = (
-            "https://api.open-meteo.com/v1/forecast"
-            f"?latitude={config.latitude}&longitude={config.longitude}"
-            "&current=temperature_2m,apparent_temperature,"
-            "weather_code,is_day"
-            "&daily=temperature_2m_max,temperature_2m_min"
-            "&temperature_unit=celsius"
-            "&forecast_days=1"
-            "&timezone=auto"
+        assert config is not None  # Required by ScreensConfig when the screen is in the rotation
+        self.source = get_open_meteo(config.latitude, config.longitude)
+        self.source.subscribe(
+            current=["temperature_2m", "apparent_temperature", "weather_code", "is_day"],
+            daily=["temperature_2m_max", "temperature_2m_min"],
         )
 
-        return self.fetch_url(url).json()
+    async def fetch_data(self):
+        # Anything fetched in the last half refresh interval, e.g. for the forecast, is recent enough
+        return await self.source.get(max_age=self.CACHE_TTL / 2)
 
     def fallback_data(self):
         return None
@@ -92,8 +98,8 @@ class Weather(Screen[WeatherData | None]):
 
         date_str = datetime.datetime.now().strftime("%m/%d")
         time_str = datetime.datetime.now().strftime("%H:%M")
-        draw.text((1, 1), f"{date_str:<5}", font=font, fill=TIME_DATE_COLOR)
-        draw.text((39, 1), f"{time_str:>5}", font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (1, 1), f"{date_str:<5}", font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (39, 1), f"{time_str:>5}", font=font, fill=TIME_DATE_COLOR)
 
         if self.data is None:
             return image
@@ -114,20 +120,19 @@ class Weather(Screen[WeatherData | None]):
 
         icon_name = get_icon(data["current"]["weather_code"], bool(data["current"]["is_day"]))
 
-        icon = Image.open(Path.cwd() / "icons" / "weather" / "32px" / f"{icon_name}.png")
-
-        image.paste(icon, (1, 11))
-        draw.text((39, 14), f"{temp_f:>2}°", font=bigfont, fill="#ffffff")
-        draw.text((58, 19), "F", font=font, fill=TIME_DATE_COLOR)
-        draw.text((39, 28), f"{temp_c:>2}°", font=bigfont, fill="#ffffff")
-        draw.text((58, 33), "C", font=font, fill=TIME_DATE_COLOR)
+        if icon_name is not None:
+            load_icon(f"weather/32px/{icon_name}").paste(image, (1, 11))
+        draw_text(draw, (39, 14), f"{temp_f:>2}°", font=bigfont, fill="#ffffff")
+        draw_text(draw, (58, 19), "F", font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (39, 28), f"{temp_c:>2}°", font=bigfont, fill="#ffffff")
+        draw_text(draw, (58, 33), "C", font=font, fill=TIME_DATE_COLOR)
 
         draw.line((4, 51, 6, 49, 8, 51), fill=HIGH_COLOR)
-        draw.text((14, 47), f"{temp_max_f:>2}°F", font=font, fill=HIGH_COLOR)
-        draw.text((40, 47), f"{temp_max_c:>2}°C", font=font, fill=HIGH_COLOR)
+        draw_text(draw, (14, 47), f"{temp_max_f:>2}°F", font=font, fill=HIGH_COLOR)
+        draw_text(draw, (40, 47), f"{temp_max_c:>2}°C", font=font, fill=HIGH_COLOR)
         draw.line((4, 57, 6, 59, 8, 57), fill=LOW_COLOR)
-        draw.text((14, 55), f"{temp_min_f:>2}°F", font=font, fill=LOW_COLOR)
-        draw.text((40, 55), f"{temp_min_c:>2}°C", font=font, fill=LOW_COLOR)
+        draw_text(draw, (14, 55), f"{temp_min_f:>2}°F", font=font, fill=LOW_COLOR)
+        draw_text(draw, (40, 55), f"{temp_min_c:>2}°C", font=font, fill=LOW_COLOR)
 
         return image
 
@@ -136,7 +141,7 @@ class Weather(Screen[WeatherData | None]):
         draw = ImageDraw.Draw(image)
 
         time_str = datetime.datetime.now().strftime("%H:%M")
-        draw.text((39, 24), f"{time_str:>5}", font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (39, 24), f"{time_str:>5}", font=font, fill=TIME_DATE_COLOR)
 
         if self.data is None:
             return image
@@ -149,12 +154,11 @@ class Weather(Screen[WeatherData | None]):
 
         icon_name = get_icon(data["current"]["weather_code"], bool(data["current"]["is_day"]))
 
-        icon = Image.open(Path.cwd() / "icons" / "weather" / "32px" / f"{icon_name}.png")
-
-        image.paste(icon, (1, 0))
-        draw.text((39, 0), f"{temp_f:>2}°", font=bigfont, fill="#ffffff")
-        draw.text((58, 5), "F", font=font, fill=TIME_DATE_COLOR)
-        draw.text((39, 11), f"{temp_c:>2}°", font=bigfont, fill="#ffffff")
-        draw.text((58, 16), "C", font=font, fill=TIME_DATE_COLOR)
+        if icon_name is not None:
+            load_icon(f"weather/32px/{icon_name}").paste(image, (1, 0))
+        draw_text(draw, (39, 0), f"{temp_f:>2}°", font=bigfont, fill="#ffffff")
+        draw_text(draw, (58, 5), "F", font=font, fill=TIME_DATE_COLOR)
+        draw_text(draw, (39, 11), f"{temp_c:>2}°", font=bigfont, fill="#ffffff")
+        draw_text(draw, (58, 16), "C", font=font, fill=TIME_DATE_COLOR)
 
         return image
@@ -1,6 +1,8 @@
 import shutil
 from pathlib import Path
 
+from matrix.resources import ASSETS_DIR
+
 
 def find_bun() -> Path:
     # If Bun is on PATH, always use that
@@ -11,10 +13,9 @@ def find_bun() -> Path:
     if (Path.home() / ".bun").exists():
         return Path.home() / ".bun" / "bin" / "bun"
 
-    # If the owner of the current working directory has an
-    # installation of Bun, use it
+    # If the owner of the checkout has an installation of Bun, use it
     # (Useful when bun is installed as "pi" but script is "root")
-    owner_path = Path(f"~{Path.cwd().owner()}").expanduser()
+    owner_path = Path(f"~{ASSETS_DIR.owner()}").expanduser()
     if (owner_path / ".bun").exists():
         return owner_path / ".bun" / "bin" / "bun"
 
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Annotated, Literal, Self
 
 from PIL import Image
-from pydantic import BaseModel, BeforeValidator, WithJsonSchema
+from pydantic import BaseModel, BeforeValidator, WithJsonSchema, model_validator
 
 
 class PanelSize(Enum):
@@ -38,6 +38,9 @@ class BlueBikesStation(BaseModel):
 
 
 class BlueBikesConfig(BaseModel):
+    # GBFS auto-discovery file of the bike share system, and the language of its feeds to use
+    gbfs_url: str = "https://gbfs.lyft.com/gbfs/1.1/bos/gbfs.json"
+    language: str = "en"
     stations: list[BlueBikesStation] = [
         BlueBikesStation(id="S32022", label="Cedar St"),
         BlueBikesStation(id="S32013", label="Trum Field"),
@@ -59,6 +62,8 @@ class MbtaLine(BaseModel):
 class MbtaConfig(BaseModel):
     api_key: str | None = None
     lines: list[MbtaLine] = []
+    # Follow predictions live from the streaming API, instead of polling them
+    streaming: bool = False
 
 
 class SpotifyConfig(BaseModel):
@@ -80,15 +85,31 @@ class FishConfig(BaseModel):
     provider: Literal["makeafish", "amy"] = "makeafish"
 
 
+# Screens that can be shown in the rotation, see matrix.screens.SCREENS
+ScreenName = Literal["mbta", "spotify", "weather", "forecast", "bluebikes", "octoprint"]
+
+
 class ScreensConfig(BaseModel):
+    # Screens to show, in order. Only these are loaded and fetch data.
+    rotation: list[ScreenName] = ["mbta", "spotify", "weather", "forecast", "bluebikes"]
     fish: FishConfig = FishConfig()
     bluebikes: BlueBikesConfig = BlueBikesConfig()
     mbta: MbtaConfig = MbtaConfig()
     spotify: SpotifyConfig = SpotifyConfig()
-    weather: Position
-    forecast: Position
-    octoprint: OctoprintConfig
+    # Only needed if the screen is in the rotation
+    weather: Position | None = None
+    forecast: Position | None = None
+    octoprint: OctoprintConfig | None = None
     matter: bool = False
+    # Seconds before a screen's turn in the rotation to start refreshing its data
+    prefetch_lead: float = 3
+
+    @model_validator(mode="after")
+    def check_rotation(self) -> Self:
+        for name in self.rotation:
+            if getattr(self, name) is None:
+                raise ValueError(f"screens.{name} must be configured to show the {name} screen")
+        return self
 
 
 class Config(BaseModel):
@@ -96,6 +117,8 @@ class Config(BaseModel):
 
     panel: PanelConfig
     screens: ScreensConfig
+    # Where to keep the last fetched data of each screen, see matrix.utils.data_store
+    data_dir: Path | None = None
 
     _simulate: bool = False
 
@@ -139,6 +162,12 @@ def get_config(simulate_arg: bool | None = None) -> Config:
     return _config_instance
 
 
+def set_config(config: Config) -> None:
+    """Replace the global configuration instance, e.g. to run without a matrix.toml."""
+    global _config_instance
+    _config_instance = config
+
+
 def get_panel_size() -> PanelSize:
     """Get the panel size from the global configuration."""
     return get_config().panel.size
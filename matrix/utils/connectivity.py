@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Backoff between attempts to reach a host that is down, doubling after each failure
+MIN_BACKOFF = 5
+MAX_BACKOFF = 5 * 60
+
+PROBE_TIMEOUT = 5
+
+# Errors that mean no usable response came back, as opposed to e.g. a bad one
+CONNECTION_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.RetryError)
+
+
+def is_unreachable(error: Exception) -> bool:
+    """Whether a request failed because the host couldn't be connected to at all.
+
+    Only these open the host's circuit breaker. A host that answers with 5xx
+    errors, or too slowly, is up, and only that request fails.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    reason = error.args[0]
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    # NameResolutionError is a NewConnectionError too
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+class HostUnavailable(requests.ConnectionError):
+    """Raised instead of making a request to a host that is known to be unreachable."""
+
+
+class CircuitBreaker:
+    """Tracks whether a host is reachable, so requests to it can fail fast while it isn't.
+
+    Once a request fails to connect the breaker opens, and stays open until a
+    probe from the ConnectivityMonitor gets through to the host again.
+    """
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.failures = 0
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures > 0
+
+    def check(self) -> None:
+        """Raise HostUnavailable if requests to this host shouldn't be attempted right now."""
+        if self.is_open:
+            retry_in = max(self.open_until - time.monotonic(), 0)
+            raise HostUnavailable(f"{self.host} is unreachable, checking again in {retry_in:.0f}s")
+
+    def record_success(self) -> bool:
+        """Mark the host as reachable. Returns True if it wasn't before."""
+        with self.lock:
+            was_down = self.failures > 0
+            self.failures = 0
+            self.open_until = 0
+        return was_down
+
+    def record_failure(self) -> bool:
+        """Mark the host as unreachable and back off before probing it. Returns True if it was reachable before."""
+        with self.lock:
+            self.failures += 1
+            backoff = min(MIN_BACKOFF * 2 ** (self.failures - 1), MAX_BACKOFF)
+            self.open_until = time.monotonic() + backoff
+            return self.failures == 1
+
+
+class ConnectivityMonitor:
+    """Keeps a circuit breaker for each upstream host, and probes hosts that are down until they come back."""
+
+    def __init__(self, on_reconnect: Callable[[str], None] | None = None) -> None:
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+        self.on_reconnect = on_reconnect
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(host)
+            return self.breakers[host]
+
+    @property
+    def unreachable_hosts(self) -> list[str]:
+        with self.lock:
+            return [host for host, breaker in self.breakers.items() if breaker.is_open]
+
+    def record_success(self, host: str) -> None:
+        if self.breaker(host).record_success():
+            logger.info("%s is reachable again", host)
+            if self.on_reconnect is not None:
+                self.on_reconnect(host)
+
+    async def probe(self, host: str, port: int) -> None:
+        """Wait out the backoff and try to connect to the host, until it succeeds."""
+        breaker = self.breaker(host)
+        while breaker.is_open:
+            await asyncio.sleep(max(breaker.open_until - time.monotonic(), 0))
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=PROBE_TIMEOUT)
+            except (OSError, TimeoutError):
+                breaker.record_failure()
+                continue
+            writer.close()
+            self.record_success(host)
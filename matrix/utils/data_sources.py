@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, TypeVar
+
+from matrix.utils.fetch_engine import FetchEngine, get_fetch_engine
+
+T = TypeVar("T")
+S = TypeVar("S", bound="DataSource")
+
+
+class DataSource(ABC, Generic[T]):
+    """Data that several screens need, fetched once for all of them.
+
+    Fetches that overlap share one request, and a result that is recent enough
+    for the caller is reused instead of fetching again.
+    """
+
+    def __init__(self, engine: FetchEngine) -> None:
+        self.engine = engine
+        self.result: T | None = None
+        self.fetched_at = 0.0
+
+        # Bumped whenever what needs fetching changes, so older results aren't reused
+        self.version = 0
+        self.result_version = -1
+        self.in_flight: asyncio.Future[T] | None = None
+
+    async def get(self, max_age: float) -> T:
+        """Return data fetched at most max_age seconds ago, fetching it if there is none."""
+        if self.in_flight is None:
+            is_current = self.result_version == self.version and time.time() - self.fetched_at <= max_age
+            if self.result is not None and is_current:
+                return self.result
+            self.in_flight = asyncio.ensure_future(self.refresh())
+        # Shielded, so one caller being cancelled doesn't cancel the request for everyone else
+        return await asyncio.shield(self.in_flight)
+
+    async def refresh(self) -> T:
+        version = self.version
+        try:
+            result = await self.fetch()
+        finally:
+            self.in_flight = None
+        self.result, self.fetched_at, self.result_version = result, time.time(), version
+        return result
+
+    @abstractmethod
+    async def fetch(self) -> T:
+        """Fetch the data for every subscriber. Runs on the fetch engine's event loop."""
+
+
+class OpenMeteo(DataSource[Any]):
+    """Forecasts for one location from open-meteo, with the variables of every subscribed screen in one request."""
+
+    def __init__(self, engine: FetchEngine, latitude: float, longitude: float) -> None:
+        super().__init__(engine)
+        self.latitude = latitude
+        self.longitude = longitude
+
+        self.current: set[str] = set()
+        self.daily: set[str] = set()
+        self.forecast_days = 1
+
+    def subscribe(self, current: Iterable[str] = (), daily: Iterable[str] = (), forecast_days: int = 1) -> None:
+        """Add the variables a screen needs to those fetched."""
+        self.current.update(current)
+        self.daily.update(daily)
+        self.forecast_days = max(self.forecast_days, forecast_days)
+        self.version += 1
+
+    async def fetch(self) -> Any:
+        params: dict[str, Any] = {
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "temperature_unit": "celsius",
+            "forecast_days": self.forecast_days,
+            "timezone": "auto",
+        }
+        if self.current:
+            params["current"] = ",".join(sorted(self.current))
+        if self.daily:
+            params["daily"] = ",".join(sorted(self.daily))
+
+        return await self.engine.get_json("https://api.open-meteo.com/v1/forecast", params=params)
+
+
+_data_sources: dict[str, DataSource] = {}
+_data_sources_lock = threading.Lock()
+
+
+def get_data_source(name: str, factory: Callable[[], S]) -> S:
+    """Get the data source with the given name, creating it on first use."""
+    with _data_sources_lock:
+        if name not in _data_sources:
+            _data_sources[name] = factory()
+        return _data_sources[name]  # type: ignore[return-value]
+
+
+def get_open_meteo(latitude: float, longitude: float) -> OpenMeteo:
+    """Get the open-meteo data source for a location, shared by every screen showing that location."""
+    return get_data_source(
+        f"open-meteo:{latitude},{longitude}",
+        lambda: OpenMeteo(get_fetch_engine(), latitude, longitude),
+    )
@@ -0,0 +1,91 @@
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from matrix.utils.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Data older than this isn't worth showing, even while offline
+MAX_DATA_AGE = 24 * 60 * 60
+
+# Minimum time between writes for each screen, to spare the SD card
+SAVE_INTERVAL = 5 * 60
+
+
+class DataStore:
+    """Keeps the last successfully fetched data of each screen on disk.
+
+    This lets screens draw immediately after a restart, from stale data,
+    instead of waiting for their first fetch.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.is_writable = True
+        self.last_saved: dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.pickle"
+
+    def load(self, name: str, version: int = 1) -> tuple[float, Any] | None:
+        """Return the saved (fetch time, data) for a screen, unless it is missing, too old or in an old format."""
+        try:
+            with self.path(name).open("rb") as f:
+                saved_version, fetched_at, data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # e.g. the data's classes changed since it was saved
+            logger.warning("Ignoring saved data for %s: %s", name, e)
+            return None
+
+        if saved_version != version or time.time() - fetched_at > MAX_DATA_AGE:
+            return None
+        return fetched_at, data
+
+    def save(self, name: str, fetched_at: float, data: Any, version: int = 1) -> None:
+        with self.lock:
+            if not self.is_writable or fetched_at - self.last_saved.get(name, 0) < SAVE_INTERVAL:
+                return
+            self.last_saved[name] = fetched_at
+
+        try:
+            payload = pickle.dumps((version, fetched_at, data), protocol=pickle.HIGHEST_PROTOCOL)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so a crash never leaves a truncated file behind
+            with tempfile.NamedTemporaryFile("wb", dir=self.directory, delete=False) as f:
+                f.write(payload)
+            os.replace(f.name, self.path(name))
+        except PermissionError as e:
+            logger.warning("Can't save screen data to %s, disabling: %s", self.directory, e)
+            self.is_writable = False
+        except Exception as e:
+            logger.exception("Error while saving data for %s: %s", name, e)
+
+
+def default_data_dir() -> Path:
+    config = get_config()
+    if config.data_dir is not None:
+        return config.data_dir
+    if sys.platform == "linux" and not config.is_simulated:
+        return Path("/var/lib/matrix")
+    return Path.home() / ".cache" / "matrix"
+
+
+_data_store_instance: DataStore | None = None
+
+
+def get_data_store() -> DataStore:
+    """Get the global data store instance."""
+    global _data_store_instance
+    if _data_store_instance is None:
+        _data_store_instance = DataStore(default_data_dir())
+    return _data_store_instance
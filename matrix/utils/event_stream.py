@@ -0,0 +1,98 @@
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Backoff between reconnection attempts, doubling after each one that fails
+MIN_BACKOFF = 1
+MAX_BACKOFF = 5 * 60
+
+CONNECT_TIMEOUT = 10
+# Servers send keep-alive comments, so a connection this quiet is dead
+READ_TIMEOUT = 60
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Parse the lines of a text/event-stream response into (event, data) pairs."""
+    event, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+
+        field, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+
+
+class EventStream:
+    """Follows a server-sent event stream on a background thread, reconnecting with backoff.
+
+    Streams get their own session and thread, since their responses never end:
+    they mustn't go through the HTTP cache or tie up one of the fetch workers.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_event: Callable[[str, str], None],
+        params: dict[str, Any] | None = None,
+        on_disconnect: Callable[[], None] | None = None,
+    ) -> None:
+        self.url = url
+        self.params = params
+        self.on_event = on_event
+        # Called when the stream ends or fails, before waiting to reconnect
+        self.on_disconnect = on_disconnect
+
+        self.session = requests.Session()
+        self.is_cancelled = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def cancel(self) -> None:
+        """Stop following the stream. Takes effect at the next event or keep-alive."""
+        self.is_cancelled = True
+
+    def run(self) -> None:
+        backoff = MIN_BACKOFF
+        while not self.is_cancelled:
+            try:
+                with self.session.get(
+                    self.url,
+                    params=self.params,
+                    headers={"Accept": "text/event-stream"},
+                    stream=True,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                ) as response:
+                    response.raise_for_status()
+                    # Event streams are always UTF-8
+                    response.encoding = "utf-8"
+                    for event, data in parse_events(response.iter_lines(decode_unicode=True)):
+                        if self.is_cancelled:
+                            return
+                        self.on_event(event, data)
+                        backoff = MIN_BACKOFF
+                logger.info("Event stream from %s ended, reconnecting", self.url)
+            except Exception as e:
+                logger.warning("Event stream from %s failed, reconnecting in %ds: %s", self.url, backoff, e)
+
+            if self.on_disconnect is not None and not self.is_cancelled:
+                self.on_disconnect()
+            time.sleep(backoff * random.uniform(1, 1.1))
+            backoff = min(backoff * 2, MAX_BACKOFF)
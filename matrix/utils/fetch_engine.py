@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import logging
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, ParamSpec, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import Retry
+
+from matrix.utils.connectivity import CONNECTION_ERRORS, ConnectivityMonitor, is_unreachable
+from matrix.utils.http_cache import CachingHTTPAdapter, http_cache
+
+logger = logging.getLogger(__name__)
+
+# Number of blocking calls (mostly HTTP requests) that can run at once, which
+# is also the number of connections kept alive to each host
+FETCH_WORKERS = 4
+
+REQUEST_TIMEOUT = 15
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class FetchEngine:
+    """Runs every screen's fetches on one asyncio event loop, sharing one pooled HTTP session.
+
+    Coroutines can fan out requests with asyncio.gather(). The requests
+    themselves block, so they run on a small fixed pool of worker threads.
+    """
+
+    def __init__(self, max_workers: int = FETCH_WORKERS) -> None:
+        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
+
+        # Keeps connections alive per host, e.g. to api-v3.mbta.com and gbfs.lyft.com
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            CachingHTTPAdapter(http_cache, max_retries=retries, pool_maxsize=max_workers),
+        )
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(self.executor)
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.lock = threading.Lock()
+
+        self.connectivity = ConnectivityMonitor()
+
+    def submit(self, coroutine: Coroutine[Any, Any, R]) -> Future[R]:
+        """Run a coroutine on the event loop from any thread."""
+        with self.lock:
+            if not self.thread.is_alive():
+                self.thread.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def run(self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """Run a blocking function on a worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    def _get(self, url: str, **kwargs: Any) -> requests.Response:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        breaker = self.connectivity.breaker(host)
+        # Fail fast while the host is down, rather than waiting out timeouts and retries
+        breaker.check()
+
+        try:
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+        except CONNECTION_ERRORS as e:
+            if is_unreachable(e) and breaker.record_failure():
+                logger.warning("Can't reach %s, pausing requests until it's back: %s", host, e)
+                port = parts.port or (80 if parts.scheme == "http" else 443)
+                self.submit(self.connectivity.probe(host, port))
+            raise
+
+        self.connectivity.record_success(host)
+        return response
+
+    def _get_json(self, url: str, keep_decoded: bool = True, **kwargs: Any) -> Any:
+        response = self._get(url, **kwargs)
+        response.raise_for_status()
+        return http_cache.decode_json(response, keep_decoded)
+
+    async def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Make a GET request with the shared session. Takes the same arguments as requests."""
+        return await self.run(self._get, url, **kwargs)
+
+    async def get_json(self, url: str, keep_decoded: bool = True, **kwargs: Any) -> Any:
+        """Make a GET request and parse the response as JSON, off the event loop.
+
+        Parsed responses are kept in the HTTP cache unless keep_decoded is False, see HTTPCache.decode_json().
+        """
+        return await self.run(self._get_json, url, keep_decoded, **kwargs)
+
+
+_fetch_engine_instance: FetchEngine | None = None
+
+
+def get_fetch_engine() -> FetchEngine:
+    """Get the global fetch engine instance."""
+    global _fetch_engine_instance
+    if _fetch_engine_instance is None:
+        _fetch_engine_instance = FetchEngine()
+    return _fetch_engine_instance
@@ -0,0 +1,135 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import Protocol
+
+from matrix.utils.fetch_engine import FetchEngine, get_fetch_engine
+
+logger = logging.getLogger(__name__)
+
+# Each refresh is delayed by up to this fraction of the TTL, so that screens
+# with the same TTL don't all hit the network at the same moment
+JITTER = 0.1
+
+
+class Fetchable(Protocol):
+    CACHE_TTL: float
+    is_cancelled: bool
+    fetch_failed: bool
+
+    def should_refresh(self) -> bool: ...
+
+    async def refresh(self) -> None: ...
+
+
+class FetchScheduler:
+    """Refreshes every screen's data from a single queue, each on its own TTL.
+
+    Targets that come due while they don't want refreshing (e.g. screens that
+    aren't going to be shown) are parked until they are woken up again.
+    """
+
+    def __init__(self, engine: FetchEngine | None = None) -> None:
+        # Heap of (due time, insertion order, target)
+        self.queue: list[tuple[float, int, Fetchable]] = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+
+        self.parked: set[Fetchable] = set()
+        # Wake-up times requested for targets that were still scheduled, applied if they get parked
+        self.pending_wakes: dict[Fetchable, float] = {}
+        self.is_paused = False
+
+        self.engine = engine or get_fetch_engine()
+        self.engine.connectivity.on_reconnect = self.retry_failed
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def add(self, target: Fetchable, delay: float = 0) -> None:
+        """Schedule a refresh of the target after the given delay."""
+        with self.condition:
+            heapq.heappush(self.queue, (time.monotonic() + delay, next(self.counter), target))
+            self.condition.notify()
+
+            if not self.thread.is_alive():
+                self.thread.start()
+
+    def wake(self, target: Fetchable, delay: float = 0) -> None:
+        """Schedule a refresh of a parked target.
+
+        Targets that are still scheduled keep their place, but are woken at the
+        requested time instead of being parked if they come due before then.
+        """
+        with self.condition:
+            if target not in self.parked:
+                self.pending_wakes[target] = time.monotonic() + delay
+                return
+            self.parked.discard(target)
+        self.add(target, delay)
+
+    def retry_failed(self, host: str | None = None) -> None:
+        """Refresh every scheduled target whose latest fetch failed right away, e.g. when the network comes back."""
+        with self.condition:
+            now = time.monotonic()
+            self.queue = [(now if target.fetch_failed else due, n, target) for due, n, target in self.queue]
+            heapq.heapify(self.queue)
+            self.condition.notify()
+
+    def pause(self) -> None:
+        """Stop refreshing anything, e.g. while the display is off."""
+        with self.condition:
+            self.is_paused = True
+
+    def resume(self) -> None:
+        with self.condition:
+            self.is_paused = False
+            parked, self.parked = self.parked, set()
+        # Anything that still doesn't want refreshing gets parked again when it comes due
+        for target in parked:
+            self.add(target)
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.queue or self.queue[0][0] > time.monotonic():
+                    timeout = self.queue[0][0] - time.monotonic() if self.queue else None
+                    self.condition.wait(timeout=timeout)
+                _, _, target = heapq.heappop(self.queue)
+
+                # Cancelled targets are dropped when they come due rather than searched for
+                if target.is_cancelled:
+                    self.pending_wakes.pop(target, None)
+                    continue
+                if self.is_paused or not target.should_refresh():
+                    wake_time = self.pending_wakes.pop(target, None)
+                    if wake_time is not None and wake_time > time.monotonic() and not self.is_paused:
+                        heapq.heappush(self.queue, (wake_time, next(self.counter), target))
+                    else:
+                        self.parked.add(target)
+                    continue
+                self.pending_wakes.pop(target, None)
+
+            self.engine.submit(self.fetch(target))
+
+    async def fetch(self, target: Fetchable) -> None:
+        try:
+            await target.refresh()
+        except Exception as e:
+            logger.exception("Error while refreshing %s: %s", target.__class__.__name__, e)
+        finally:
+            # Only reschedule once the fetch finishes, so a target never runs concurrently with itself
+            if not target.is_cancelled:
+                self.add(target, target.CACHE_TTL * (1 + random.uniform(0, JITTER)))
+
+
+_fetch_scheduler_instance: FetchScheduler | None = None
+
+
+def get_fetch_scheduler() -> FetchScheduler:
+    """Get the global fetch scheduler instance."""
+    global _fetch_scheduler_instance
+    if _fetch_scheduler_instance is None:
+        _fetch_scheduler_instance = FetchScheduler()
+    return _fetch_scheduler_instance
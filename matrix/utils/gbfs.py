@@ -0,0 +1,53 @@
+import time
+from datetime import datetime
+from typing import Any
+
+from matrix.utils.fetch_engine import FetchEngine
+from matrix.utils.http_cache import http_cache
+
+
+def expires_at(file: Any) -> float:
+    """When a GBFS file stops being valid. last_updated is POSIX time before 3.0, and RFC 3339 since."""
+    last_updated = file["last_updated"]
+    if isinstance(last_updated, str):
+        last_updated = datetime.fromisoformat(last_updated).timestamp()
+    return last_updated + file["ttl"]
+
+
+class GbfsClient:
+    """Reads the feeds of a bike share system, found through its gbfs.json auto-discovery file.
+
+    Every GBFS file says how long it stays valid (`last_updated` + `ttl`), and
+    is served from the HTTP cache without a request until then.
+    """
+
+    def __init__(self, engine: FetchEngine, url: str, language: str = "en") -> None:
+        self.engine = engine
+        self.url = url
+        self.language = language
+
+        # Feed name -> URL, and until when that list is valid
+        self.feed_urls: dict[str, str] = {}
+        self.feed_urls_expire = 0.0
+
+    async def get_file(self, url: str, keep_decoded: bool = True) -> Any:
+        file = await self.engine.get_json(url, keep_decoded)
+        http_cache.set_expiry(url, expires_at(file))
+        return file
+
+    async def discover(self) -> None:
+        gbfs = await self.get_file(self.url)
+        data = gbfs["data"]
+        # GBFS 1.x and 2.x list feeds per language, 3.x only once
+        feeds = data["feeds"] if "feeds" in data else data.get(self.language, next(iter(data.values())))["feeds"]
+
+        self.feed_urls = {feed["name"]: feed["url"] for feed in feeds}
+        self.feed_urls_expire = expires_at(gbfs)
+
+    async def get_feed(self, name: str, keep_decoded: bool = True) -> Any:
+        """Fetch a feed, e.g. station_status, by name."""
+        if time.time() >= self.feed_urls_expire:
+            await self.discover()
+        if name not in self.feed_urls:
+            raise LookupError(f"{self.url} has no {name} feed")
+        return await self.get_file(self.feed_urls[name], keep_decoded)
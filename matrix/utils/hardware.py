@@ -1,11 +1,13 @@
 from gpiozero import Button, RotaryEncoder
-from rgbmatrix import RGBMatrix, RGBMatrixOptions  # type: ignore
+from PIL import Image
+from rgbmatrix import FrameCanvas, RGBMatrix, RGBMatrixOptions  # type: ignore
 
 from matrix.utils.config import get_config
 
 
 class Hardware:
     matrix: RGBMatrix
+    canvas: FrameCanvas
     dial: RotaryEncoder
     button: Button
 
@@ -19,5 +21,21 @@ class Hardware:
         self.matrix = RGBMatrix(options=matrix_options)
         self.matrix.brightness = panel.brightness
 
+        # Off-screen canvas that frames are drawn into before being swapped onto the panel
+        self.canvas = self.matrix.CreateFrameCanvas()
+
         self.dial = RotaryEncoder(7, 19, max_steps=1024, wrap=True, bounce_time=0.1)
         self.button = Button(25, bounce_time=0.1)
+
+    def show(self, image: Image.Image) -> None:
+        """Draw an image into the back canvas and swap it onto the panel at the next refresh."""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        # Brightness changes only apply to the canvas on screen, so carry them over
+        self.canvas.brightness = self.matrix.brightness
+        self.canvas.SetImage(image)
+        self.canvas = self.matrix.SwapOnVSync(self.canvas)
+
+    def clear(self) -> None:
+        self.matrix.Clear()
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Total size of response bodies to keep, enough for the GBFS feeds plus everything else
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+# Headers describing the body of a 304, which mustn't overwrite those of the cached body
+BODY_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+@dataclass
+class CacheEntry:
+    content: bytes
+    headers: CaseInsensitiveDict[str]
+    # time.time() until which the response can be used without revalidating
+    expires: float = 0
+    # Parsed JSON body, so that unchanged responses aren't parsed again
+    decoded: Any = field(default=None, repr=False)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires
+
+    def to_response(self, request: PreparedRequest) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.url = request.url or ""
+        response.request = request
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+
+def parse_cache_control(value: str) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for directive in value.split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def get_expiry(headers: CaseInsensitiveDict[str]) -> float:
+    """Return until when a response can be reused without revalidating, per its Cache-Control header."""
+    directives = parse_cache_control(headers.get("Cache-Control", ""))
+    if "no-cache" in directives or "max-age" not in directives:
+        return 0
+    try:
+        max_age = int(directives["max-age"] or 0) - int(headers.get("Age", 0))
+    except ValueError:
+        return 0
+    return time.time() + max_age
+
+
+class HTTPCache:
+    """A bounded in-memory cache of GET responses, shared by every screen's session.
+
+    Responses are reused while they are fresh (per Cache-Control: max-age),
+    and revalidated with If-None-Match / If-Modified-Since once they aren't.
+    """
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, url: str) -> CacheEntry | None:
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                self.entries.move_to_end(url)
+            return entry
+
+    def store(self, url: str, response: Response) -> None:
+        directives = parse_cache_control(response.headers.get("Cache-Control", ""))
+        is_cacheable = "ETag" in response.headers or "Last-Modified" in response.headers or "max-age" in directives
+        if "no-store" in directives or not is_cacheable or len(response.content) > self.max_bytes // 2:
+            self.remove(url)
+            return
+
+        entry = CacheEntry(
+            content=response.content,
+            headers=CaseInsensitiveDict(response.headers),
+            expires=get_expiry(response.headers),
+        )
+        with self.lock:
+            if (old_entry := self.entries.pop(url, None)) is not None:
+                self.size -= len(old_entry.content)
+            self.entries[url] = entry
+            self.size += len(entry.content)
+
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted.content)
+
+    def remove(self, url: str) -> None:
+        with self.lock:
+            if (entry := self.entries.pop(url, None)) is not None:
+                self.size -= len(entry.content)
+
+    def set_expiry(self, url: str, expires: float) -> None:
+        """Override how long a cached response stays fresh, e.g. from a GBFS feed's `ttl` field."""
+        if (entry := self.get(url)) is not None:
+            entry.expires = expires
+
+    def decode_json(self, response: Response, keep_decoded: bool = True) -> Any:
+        """Return the response body parsed as JSON, reusing the parsed body of cached responses.
+
+        With keep_decoded=False the parsed body isn't kept, for large responses that callers only pick a few values from.
+        """
+        entry = self.get(response.url)
+        if entry is None or entry.content is not response.content:
+            return response.json()
+        if entry.decoded is not None:
+            return entry.decoded
+        decoded = response.json()
+        if keep_decoded:
+            entry.decoded = decoded
+        return decoded
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """Serves GET requests from an HTTPCache, using conditional requests to revalidate."""
+
+    def __init__(self, cache: HTTPCache, **kwargs: Any) -> None:
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        if request.method != "GET" or request.url is None:
+            return super().send(request, *args, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None:
+            if entry.is_fresh:
+                return entry.to_response(request)
+            if etag := entry.headers.get("ETag"):
+                request.headers["If-None-Match"] = etag
+            if last_modified := entry.headers.get("Last-Modified"):
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = super().send(request, *args, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            entry.headers.update(
+                (name, value) for name, value in response.headers.items() if name.lower() not in BODY_HEADERS
+            )
+            entry.expires = get_expiry(response.headers)
+            response.close()
+            return entry.to_response(request)
+
+        if response.status_code == 200:
+            self.cache.store(request.url, response)
+
+        return response
+
+
+http_cache = HTTPCache()
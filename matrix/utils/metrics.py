@@ -0,0 +1,113 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from datadog.dogstatsd.base import statsd
+
+logger = logging.getLogger(__name__)
+
+# Number of recent samples kept per histogram
+HISTOGRAM_SIZE = 1024
+
+PERCENTILES = (50, 95, 99)
+
+Tags = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Keeps a window of the most recent samples and reports percentiles over them."""
+
+    def __init__(self) -> None:
+        self.samples: deque[float] = deque(maxlen=HISTOGRAM_SIZE)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+
+    def summary(self) -> dict[str, float]:
+        samples = sorted(self.samples)
+        summary: dict[str, float] = {"count": self.count}
+        if not samples:
+            return summary
+        for p in PERCENTILES:
+            # nearest-rank percentile
+            index = max(math.ceil(p / 100 * len(samples)) - 1, 0)
+            summary[f"p{p}"] = samples[index]
+        summary["max"] = samples[-1]
+        return summary
+
+
+class Metrics:
+    """In-process timing histograms for each stage of the frame pipeline.
+
+    Samples are keyed by stage name (e.g. "render", "diff", "encode", "upload")
+    and a set of tags such as the active mode and screen.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.histograms: dict[tuple[str, Tags], Histogram] = {}
+
+    def record(self, stage: str, seconds: float, **tags: str) -> None:
+        key = (stage, tuple(sorted(tags.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.add(seconds)
+
+    @contextmanager
+    def timed(self, stage: str, **tags: str) -> Iterator[None]:
+        """Record how long the body of the `with` block takes."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - t0, **tags)
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """Return the percentiles of every histogram, grouped by stage, in milliseconds."""
+        with self.lock:
+            summaries = [(stage, tags, histogram.summary()) for (stage, tags), histogram in self.histograms.items()]
+
+        result: dict[str, list[dict]] = {}
+        for stage, tags, summary in sorted(summaries):
+            result.setdefault(stage, []).append(
+                {
+                    "tags": dict(tags),
+                    "count": summary.pop("count"),
+                    **{f"{name}_ms": round(value * 1000, 3) for name, value in summary.items()},
+                }
+            )
+        return result
+
+    def flush_to_statsd(self) -> None:
+        """Send the current percentiles of every histogram to statsd."""
+        for stage, entries in self.snapshot().items():
+            for entry in entries:
+                tags = [f"{name}:{value}" for name, value in entry["tags"].items()]
+                for p in PERCENTILES:
+                    if (value := entry.get(f"p{p}_ms")) is not None:
+                        statsd.gauge(f"matrix.frame.{stage}.p{p}", value / 1000, tags=tags)
+        statsd.flush()
+
+    def start_forwarding(self, interval: float = 10) -> None:
+        """Periodically forward percentiles to statsd from a background thread."""
+
+        def forward() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush_to_statsd()
+                except Exception as e:
+                    logger.exception("Error while forwarding metrics: %s", e)
+
+        threading.Thread(target=forward, daemon=True).start()
+
+
+metrics = Metrics()
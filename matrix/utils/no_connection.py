@@ -6,6 +6,7 @@ from PIL import Image, ImageDraw
 from matrix.resources.fonts import bigfont, font, smallfont
 from matrix.utils.config import get_panel_size
 from matrix.utils.panels import PanelSize
+from matrix.utils.text import draw_text
 
 
 def get_image_no_connection() -> Image.Image:
@@ -18,9 +19,9 @@ def get_image_no_connection() -> Image.Image:
             time_str = datetime.datetime.now().strftime("%H:%M")
             date_str = datetime.datetime.now().strftime("%m/%d/%y")
 
-            draw.text((18, 10), text=f"{time_str:0>5}", font=bigfont, fill="#ffffff")
-            draw.text((12, 28), text=f"{date_str:0>8}", font=font, fill="#ffffff")
-            draw.text((7, 52), text="no connection", font=smallfont, fill="#888888")
+            draw_text(draw, (18, 10), f"{time_str:0>5}", font=bigfont, fill="#ffffff")
+            draw_text(draw, (12, 28), f"{date_str:0>8}", font=font, fill="#ffffff")
+            draw_text(draw, (7, 52), "no connection", font=smallfont, fill="#888888")
 
             return image
 
@@ -31,9 +32,9 @@ def get_image_no_connection() -> Image.Image:
             time_str = datetime.datetime.now().strftime("%H:%M")
             date_str = datetime.datetime.now().strftime("%m/%d/%y")
 
-            draw.text((18, 2), text=f"{time_str:0>5}", font=bigfont, fill="#ffffff")
-            draw.text((12, 12), text=f"{date_str:0>8}", font=font, fill="#ffffff")
-            draw.text((7, 24), text="no connection", font=smallfont, fill="#888888")
+            draw_text(draw, (18, 2), f"{time_str:0>5}", font=bigfont, fill="#ffffff")
+            draw_text(draw, (12, 12), f"{date_str:0>8}", font=font, fill="#ffffff")
+            draw_text(draw, (7, 24), "no connection", font=smallfont, fill="#888888")
 
             return image
         case _:
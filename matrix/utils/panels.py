@@ -1,9 +1,18 @@
 from PIL import Image
 
 from matrix.utils.config import PanelSize, get_panel_size
+from matrix.utils.schedule import next_minute
 
 
 class Drawable:
+    def next_update(self) -> float | None:
+        """Return the time (as in time.time()) at which this image next needs to be redrawn.
+
+        By default this is the start of the next minute, since most screens show a clock.
+        Return None if the image only changes on user input or when new data arrives.
+        """
+        return next_minute()
+
     def get_image(self) -> Image.Image | None:
         """Get the current image for this screen. Delegates to size-specific methods by default.
 
@@ -0,0 +1,40 @@
+import math
+import threading
+import time
+
+# Upper bound on the frame rate, so that a drawable asking for an immediate
+# redraw can't spin the render loop
+FRAME_INTERVAL = 1 / 30
+
+_redraw_requested = threading.Event()
+
+
+def next_minute(now: float | None = None) -> float:
+    """Return the time at which the next wall-clock minute starts."""
+    if now is None:
+        now = time.time()
+    return (math.floor(now / 60) + 1) * 60
+
+
+def next_frame(now: float | None = None) -> float:
+    """Return the time of the next frame, for drawables that animate continuously."""
+    if now is None:
+        now = time.time()
+    return now + FRAME_INTERVAL
+
+
+def request_redraw() -> None:
+    """Wake the render loop, e.g. after new data arrives or on user input."""
+    _redraw_requested.set()
+
+
+def wait_for_redraw(deadline: float | None) -> bool:
+    """Sleep until the deadline passes or a redraw is requested.
+
+    A deadline of None sleeps until the next request. Returns True if woken by a request.
+    """
+    timeout = None if deadline is None else max(deadline - time.time(), 0)
+    if _redraw_requested.wait(timeout=timeout):
+        _redraw_requested.clear()
+        return True
+    return False
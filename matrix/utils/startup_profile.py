@@ -0,0 +1,112 @@
+import builtins
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Number of slowest imports to report
+REPORT_IMPORTS = 20
+
+
+class StartupProfile:
+    """Times startup up to the first frame: each import, and each step of creating the app.
+
+    Import times are self times, excluding the imports they trigger, like
+    `python -X importtime`. Only imports on the main thread are counted.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.original_import = builtins.__import__
+
+        # Module name -> seconds spent importing it
+        self.imports: dict[str, float] = {}
+        # Time spent in the imports that the import at each level of the stack triggered
+        self.import_stack: list[float] = []
+        # (step name, seconds) in the order they started, so steps come before the steps within them
+        self.steps: list[tuple[str, float]] = []
+
+    def install(self) -> None:
+        builtins.__import__ = self.timed_import
+
+    def uninstall(self) -> None:
+        builtins.__import__ = self.original_import
+
+    def timed_import(
+        self,
+        name: str,
+        globals: dict[str, Any] | None = None,
+        locals: dict[str, Any] | None = None,
+        fromlist: Any = (),
+        level: int = 0,
+    ) -> Any:
+        if threading.current_thread() is not threading.main_thread():
+            return self.original_import(name, globals, locals, fromlist, level)
+        if level > 0 and globals is not None:
+            name = importlib.util.resolve_name("." * level + name, globals.get("__package__"))
+            level, globals = 0, None
+        if name in sys.modules and not fromlist:
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        t0 = time.perf_counter()
+        self.import_stack.append(0.0)
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - t0
+            children = self.import_stack.pop()
+            if self.import_stack:
+                self.import_stack[-1] += elapsed
+            self.imports[name] = self.imports.get(name, 0.0) + elapsed - children
+
+    def report(self) -> None:
+        logger.info("Startup took %.0f ms to the first frame", (time.perf_counter() - self.started) * 1000)
+        for step, seconds in self.steps:
+            logger.info("  %-24s %8.1f ms", step, seconds * 1000)
+
+        logger.info("Slowest imports (self time):")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+        for name, seconds in slowest[:REPORT_IMPORTS]:
+            logger.info("  %-40s %8.1f ms", name, seconds * 1000)
+
+
+_profile: StartupProfile | None = None
+
+
+def start_startup_profile() -> None:
+    """Start timing startup, for --profile-startup. Imports are only timed from here on."""
+    global _profile
+    _profile = StartupProfile()
+    _profile.install()
+
+
+@contextmanager
+def startup_step(name: str) -> Iterator[None]:
+    """Time a step of startup, if it's being profiled."""
+    if _profile is None:
+        yield
+        return
+    steps = _profile.steps
+    index = len(steps)
+    steps.append((name, 0.0))
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        steps[index] = (name, time.perf_counter() - t0)
+
+
+def finish_startup_profile() -> None:
+    """Call once a frame has been shown. Reports the startup profile the first time, if there is one."""
+    global _profile
+    if _profile is None:
+        return
+    _profile.uninstall()
+    _profile.report()
+    _profile = None
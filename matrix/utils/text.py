@@ -0,0 +1,33 @@
+import functools
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Number of distinct strings whose bitmaps are kept, e.g. every minute of the clock and every countdown
+TEXT_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def text_mask(text: str, font: ImageFont.ImageFont) -> Image.Image:
+    """Rasterize a string once, as a mask that can be drawn in any color."""
+    _, _, width, height = font.getbbox(text)
+    mask = Image.new("L", (width, height))
+    ImageDraw.Draw(mask).text((0, 0), text, font=font, fill=255)
+    return mask
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def text_length(text: str, font: ImageFont.ImageFont) -> float:
+    """The same as ImageDraw.textlength(), but memoized."""
+    return font.getlength(text)
+
+
+def draw_text(
+    draw: ImageDraw.ImageDraw,
+    xy: tuple[float, float],
+    text: str,
+    font: ImageFont.ImageFont,
+    fill: str | tuple[int, ...],
+) -> None:
+    """Draw a line of text, the same as ImageDraw.text() but blitting a cached bitmap of it."""
+    x, y = xy
+    draw.bitmap((int(x), int(y)), text_mask(text, font), fill=fill)
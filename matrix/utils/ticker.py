@@ -0,0 +1,80 @@
+import math
+import time
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+# Pixels per second, the same as the old one-pixel-per-frame marquee at 30 fps
+SCROLL_SPEED = 30
+
+# Space between the end of the text and its next repetition
+GAP = "  "
+
+
+class Ticker:
+    """A line of text shown through a fixed-width window, scrolling if it doesn't fit.
+
+    The text is rasterized once whenever it changes, and each frame crops a
+    window out of it at an offset given by the time since it was set.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        font: ImageFont.ImageFont,
+        fill: str,
+        speed: float = SCROLL_SPEED,
+    ) -> None:
+        self.width = width
+        self.font = font
+        self.color = ImageColor.getrgb(fill)
+        self.speed = speed
+
+        self.text: str | None = None
+        self.strip = Image.new("L", (width, 1))
+        # Width of the text plus the gap, after which the scrolling repeats
+        self.period = 0
+        self.is_scrolling = False
+        self.started = 0.0
+
+    def set_text(self, text: str) -> None:
+        """Change the text, restarting the scrolling. Does nothing if the text is the same."""
+        if text == self.text:
+            return
+        self.text = text
+        self.started = time.time()
+
+        text_width = math.ceil(self.font.getlength(text))
+        height = self.font.getbbox(text + GAP)[3] or 1
+        self.is_scrolling = text_width > self.width
+
+        if self.is_scrolling:
+            # Two copies, so that any window of the strip is a single crop
+            self.period = math.ceil(self.font.getlength(text + GAP))
+            self.strip = Image.new("L", (self.period * 2, height))
+            draw = ImageDraw.Draw(self.strip)
+            draw.text((0, 0), text, font=self.font, fill=255)
+            draw.text((self.period, 0), text, font=self.font, fill=255)
+        else:
+            self.period = 0
+            self.strip = Image.new("L", (self.width, height))
+            ImageDraw.Draw(self.strip).text((0, 0), text, font=self.font, fill=255)
+
+    @property
+    def offset(self) -> int:
+        if not self.is_scrolling:
+            return 0
+        return int((time.time() - self.started) * self.speed) % self.period
+
+    def draw(self, image: Image.Image, xy: tuple[int, int]) -> None:
+        """Draw the visible part of the text onto an image, with its top left corner at the given point."""
+        x, y = xy
+        offset = self.offset
+        window = self.strip.crop((offset, 0, offset + self.width, self.strip.height))
+        image.paste(self.color, (x, y, x + self.width, y + self.strip.height), window)
+
+    def next_update(self) -> float | None:
+        """Return when the text next moves, or None if it doesn't scroll."""
+        if not self.is_scrolling:
+            return None
+        steps = math.floor((time.time() - self.started) * self.speed) + 1
+        return self.started + steps / self.speed
@@ -2,14 +2,16 @@ import io
 import logging
 import threading
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
-from flask import Flask, Response, render_template, request
 from PIL import Image
-from werkzeug import serving
 
-logger = logging.getLogger(__name__)
+from matrix.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from flask import Flask
 
-serving._log_add_style = False
+logger = logging.getLogger(__name__)
 
 
 class WebUI:
@@ -24,9 +26,19 @@ class WebUI:
         self.frame_get = threading.Condition()
         self.frame: bytes | None = None
 
-        self.app = Flask(__name__)
+        self.on_rotation_clockwise = on_rotation_clockwise
+        self.on_rotation_counterclockwise = on_rotation_counterclockwise
+        self.on_press = on_press
+
+        self.thread = threading.Thread(target=self.run, args=(port,), daemon=True)
+        self.thread.start()
 
-        @self.app.route("/")
+    def create_app(self) -> "Flask":
+        from flask import Flask, Response, render_template, request
+
+        app = Flask(__name__)
+
+        @app.route("/")
         def index():
             logger.info(
                 "New connection from %s via '%s'",
@@ -35,7 +47,7 @@ class WebUI:
             )
             return render_template("index.html")
 
-        @self.app.route("/preview")
+        @app.route("/preview")
         def preview():
             def generate_video_stream():
                 yield b"--frame\r\nContent-Type: image/png\r\n\r\n"
@@ -53,32 +65,40 @@ class WebUI:
                 mimetype="multipart/x-mixed-replace; boundary=frame",
             )
 
-        @self.app.route("/actions/clockwise", methods=["POST"])
+        @app.route("/metrics")
+        def frame_metrics():
+            return metrics.snapshot()
+
+        @app.route("/actions/clockwise", methods=["POST"])
         def clockwise():
-            on_rotation_clockwise()
+            self.on_rotation_clockwise()
             return "", 204
 
-        @self.app.route("/actions/counterclockwise", methods=["POST"])
+        @app.route("/actions/counterclockwise", methods=["POST"])
         def counterclockwise():
-            on_rotation_counterclockwise()
+            self.on_rotation_counterclockwise()
             return "", 204
 
-        @self.app.route("/actions/press", methods=["POST"])
+        @app.route("/actions/press", methods=["POST"])
         def press():
-            on_press()
+            self.on_press()
             return "", 204
 
-        self.thread = threading.Thread(target=self.run, args=(port,), daemon=True)
-        self.thread.start()
+        return app
 
     def run(self, port: int) -> None:
-        self.app.run("0.0.0.0", port)
-
-    def send_frame(self, pil_frame: Image.Image) -> None:
-        image_bytes = io.BytesIO()
-        pil_image = Image.new("RGB", (64, 64), (255, 0, 255))
-        pil_image.paste(pil_frame)
-        pil_image.save(image_bytes, format="PNG")
-        self.frame = image_bytes.getvalue()
+        # Flask is imported here, on the web UI's thread, so that importing it doesn't hold up the first frame
+        from werkzeug import serving
+
+        serving._log_add_style = False
+        self.create_app().run("0.0.0.0", port)
+
+    def send_frame(self, pil_frame: Image.Image, **tags: str) -> None:
+        with metrics.timed("encode", **tags):
+            image_bytes = io.BytesIO()
+            pil_image = Image.new("RGB", (64, 64), (255, 0, 255))
+            pil_image.paste(pil_frame)
+            pil_image.save(image_bytes, format="PNG")
+            self.frame = image_bytes.getvalue()
         with self.frame_get:
             self.frame_get.notify_all()